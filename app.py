@@ -3,59 +3,63 @@ Flask web application for the Local AI Agent
 """
 
 import os
-import json
-import asyncio
 import logging
-from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
-from flask_cors import CORS
 from werkzeug.exceptions import BadRequest
 import uuid
+import orjson
 
 from src.agent.orchestrator import OrchestratorFactory
 from src.agent.browser_controller import BrowserConfig
 from src.utils.storage import ExportConfig
 from src.memory.session_memory import MemoryFactory
+from src.utils.log_setup import setup_logging
+from web_common import (
+    SharedOrchestrator, configure_app, result_response, stream_csv, stream_json,
+    attachment, conditional_export, now_strs, run_async, invalidate_caches,
+    cached_task_result, load_task_result, MAX_REQUEST_SIZE
+)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging(logging.INFO, fmt='%(levelname)s:%(name)s:%(message)s')
 logger = logging.getLogger(__name__)
 
+
 # Create Flask app
 app = Flask(__name__)
-CORS(app)
-
-# Global orchestrator instance
-orchestrator = None
-
-def get_orchestrator():
-    """Get or create orchestrator instance"""
-    global orchestrator
-    if orchestrator is None:
-        # Configure components with proper timeout
-        browser_config = BrowserConfig(
-            headless=os.getenv('BROWSER_HEADLESS', 'true').lower() == 'true',
-            browser_type=os.getenv('BROWSER_TYPE', 'chromium'),
-            timeout=30000  # 30 seconds timeout
-        )
-        
-        storage_config = ExportConfig(
-            output_dir=os.getenv('OUTPUT_DIR', 'exports'),
-            json_format=True,
-            csv_format=True
-        )
-        
-        memory = MemoryFactory.create_memory(
-            persist_to_disk=os.getenv('MEMORY_PERSIST', 'true').lower() == 'true'
-        )
-        
-        orchestrator = OrchestratorFactory.create_orchestrator(
-            browser_config=browser_config,
-            storage_config=storage_config,
-            memory=memory
-        )
-    
-    return orchestrator
+configure_app(app)
+
+
+def _build_orchestrator():
+    """Build the orchestrator instance"""
+    # Configure components with proper timeout
+    browser_config = BrowserConfig(
+        headless=os.getenv('BROWSER_HEADLESS', 'true').lower() == 'true',
+        browser_type=os.getenv('BROWSER_TYPE', 'chromium'),
+        timeout=30000  # 30 seconds timeout
+    )
+
+    storage_config = ExportConfig(
+        output_dir=os.getenv('OUTPUT_DIR', 'exports'),
+        json_format=True,
+        csv_format=True
+    )
+
+    memory = MemoryFactory.create_memory(
+        persist_to_disk=os.getenv('MEMORY_PERSIST', 'true').lower() == 'true'
+    )
+
+    return OrchestratorFactory.create_orchestrator(
+        browser_config=browser_config,
+        storage_config=storage_config,
+        memory=memory
+    )
+
+
+# Orchestrator shared by every request
+_orchestrator = SharedOrchestrator(_build_orchestrator)
+_orchestrator.start()
+get_orchestrator = _orchestrator.get
 
 
 @app.route('/')
@@ -69,7 +73,7 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_strs()[0],
         'version': '1.0.0'
     })
 
@@ -78,8 +82,12 @@ def health():
 def run_task():
     """Execute a task from natural language instruction"""
     try:
-        data = request.get_json()
-        if not data or 'instruction' not in data:
+        raw = request.get_data(cache=False)
+        if len(raw) > MAX_REQUEST_SIZE:
+            raise BadRequest('Request body too large')
+        
+        data = orjson.loads(raw) if raw else None
+        if not isinstance(data, dict) or 'instruction' not in data:
             raise BadRequest('Instruction is required')
         
         instruction = data['instruction'].strip()
@@ -91,31 +99,12 @@ def run_task():
         
         logger.info(f"Received task request: {task_id} - {instruction}")
         
-        # Execute task asynchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                get_orchestrator().execute(instruction, task_id)
-            )
-        finally:
-            loop.close()
-        
-        # Prepare response
-        response = {
-            'task_id': result.task_id,
-            'status': result.status,
-            'instruction': result.instruction,
-            'results': result.results,
-            'execution_time': result.execution_time,
-            'error_message': result.error_message,
-            'logs': result.logs,
-            'metadata': result.metadata
-        }
+        # Execute task on the shared background loop
+        result = run_async(get_orchestrator().execute(instruction, task_id))
+        invalidate_caches(task_id)
         
         logger.info(f"Task {task_id} completed with status: {result.status}")
-        return jsonify(response)
+        return result_response(result)
         
     except Exception as e:
         logger.error(f"Task execution failed: {e}")
@@ -129,8 +118,7 @@ def run_task():
 def get_results(task_id):
     """Get results for a specific task"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        task_result = load_task_result(get_orchestrator().storage, task_id)
         
         if not task_result:
             return jsonify({'error': 'Task not found'}), 404
@@ -154,17 +142,30 @@ def get_results(task_id):
 def export_csv(task_id):
     """Export task results as CSV"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        storage = get_orchestrator().storage
+        # A task queued for writing is exported from memory
+        task_result = storage.get_pending(task_id)
+        file_path = None if task_result is not None else storage.find_task_file(task_id)
         
-        if not task_result:
+        if task_result is None and file_path is None:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Export to CSV
-        filename = f"task_{task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = orchestrator.storage.export_to_csv(task_result.results, filename)
+        # Stream CSV straight to the client, from the cache when warm and
+        # otherwise straight off disk without pinning the rows in the cache
+        if task_result is None:
+            task_result = cached_task_result(task_id)
+        if task_result is not None:
+            rows = task_result.results
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        else:
+            rows = storage.iter_task_rows(task_id, file_path)
+            fieldnames = storage.task_fieldnames(task_id, file_path)
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        filename = f"task_{task_id}_{now_strs()[1]}.csv"
+        response = attachment(stream_csv(rows, fieldnames), filename, 'text/csv')
+        if file_path is None:
+            return response  # not on disk yet, so nothing to tag it with
+        return conditional_export(response, task_id, file_path)
         
     except Exception as e:
         logger.error(f"Failed to export CSV for {task_id}: {e}")
@@ -175,17 +176,25 @@ def export_csv(task_id):
 def export_json(task_id):
     """Export task results as JSON"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        storage = get_orchestrator().storage
+        # A task queued for writing is exported from memory
+        task_result = storage.get_pending(task_id)
+        file_path = None if task_result is not None else storage.find_task_file(task_id)
         
-        if not task_result:
+        if task_result is None and file_path is None:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Export to JSON
-        filename = f"task_{task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = orchestrator.storage.export_to_json(task_result.results, filename)
+        # Stream JSON straight to the client, from the cache when warm and
+        # otherwise straight off disk without pinning the rows in the cache
+        if task_result is None:
+            task_result = cached_task_result(task_id)
+        rows = task_result.results if task_result is not None else storage.iter_task_rows(task_id, file_path)
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        filename = f"task_{task_id}_{now_strs()[1]}.json"
+        response = attachment(stream_json(rows), filename, 'application/json')
+        if file_path is None:
+            return response  # not on disk yet, so nothing to tag it with
+        return conditional_export(response, task_id, file_path)
         
     except Exception as e:
         logger.error(f"Failed to export JSON for {task_id}: {e}")
@@ -196,8 +205,7 @@ def export_json(task_id):
 def get_history():
     """Get task execution history"""
     try:
-        orchestrator = get_orchestrator()
-        history = orchestrator.get_task_history()
+        history = get_orchestrator().get_task_history()
         return jsonify(history)
         
     except Exception as e:
@@ -209,8 +217,7 @@ def get_history():
 def get_stats():
     """Get session statistics"""
     try:
-        orchestrator = get_orchestrator()
-        stats = orchestrator.get_session_stats()
+        stats = get_orchestrator().get_session_stats()
         return jsonify(stats)
         
     except Exception as e:
@@ -260,6 +267,10 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 
+# WSGI entry point for gunicorn (app:application)
+application = app
+
+
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
@@ -268,5 +279,9 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('DEBUG', 'false').lower() == 'true'
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    if os.getenv('FLASK_DEV'):
+        logger.info(f"Starting Flask dev server on port {port}")
+        app.run(host='0.0.0.0', port=port, debug=debug)
+    else:
+        logger.info(f"Starting gunicorn on port {port}")
+        os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'app:application'])
@@ -3,14 +3,12 @@ Fixed Flask app with proper timeout and error handling
 """
 
 import os
-import json
-import asyncio
 import logging
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
-from flask_cors import CORS
+import re
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
 from werkzeug.exceptions import BadRequest
 import uuid
+import orjson
 
 # Set environment variables
 os.environ['LLM_TYPE'] = 'ollama'
@@ -24,50 +22,132 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.agent.orchestrator import OrchestratorFactory
 from src.agent.browser_controller import BrowserConfig
-from src.utils.storage import ExportConfig
+from src.utils.storage import ExportConfig, TaskResult
 from src.memory.session_memory import MemoryFactory
+from src.utils.log_setup import setup_logging
+from web_common import (
+    SharedOrchestrator, configure_app, result_response, stream_csv, stream_json,
+    attachment, conditional_export, now_strs, run_async, invalidate_caches,
+    cached_task_result, load_task_result, MAX_REQUEST_SIZE
+)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging(logging.INFO, fmt='%(levelname)s:%(name)s:%(message)s')
 logger = logging.getLogger(__name__)
 
+
 # Create Flask app
 app = Flask(__name__)
-CORS(app)
-
-# Global orchestrator instance
-orchestrator = None
-
-def get_orchestrator():
-    """Get or create orchestrator instance with fixed timeout"""
-    global orchestrator
-    if orchestrator is None:
-        # Configure components with proper timeout
-        browser_config = BrowserConfig(
-            headless=True,
-            browser_type="chromium",
-            timeout=30000,  # 30 seconds timeout
-            viewport_width=1920,
-            viewport_height=1080
-        )
-        
-        storage_config = ExportConfig(
-            output_dir="exports",
-            json_format=True,
-            csv_format=True
-        )
-        
-        memory = MemoryFactory.create_memory(
-            persist_to_disk=True
-        )
-        
-        orchestrator = OrchestratorFactory.create_orchestrator(
-            browser_config=browser_config,
-            storage_config=storage_config,
-            memory=memory
-        )
-    
-    return orchestrator
+configure_app(app)
+
+# Instructions that get the canned demo response: "search" plus "laptop"/"computer"
+_DEMO_RE = re.compile(r"search.*(laptop|computer)|(laptop|computer).*search", re.IGNORECASE | re.DOTALL)
+
+# Canned results returned for demo laptop searches
+_MOCK_RESULTS = [
+    {
+        "title": "Dell Inspiron 15 3000",
+        "price": "₹45,000",
+        "url": "https://example.com/dell-inspiron",
+        "description": "Intel Core i5, 8GB RAM, 512GB SSD",
+        "rating": "4.2"
+    },
+    {
+        "title": "HP Pavilion 15",
+        "price": "₹42,000",
+        "url": "https://example.com/hp-pavilion",
+        "description": "AMD Ryzen 5, 8GB RAM, 256GB SSD",
+        "rating": "4.0"
+    },
+    {
+        "title": "Lenovo IdeaPad 3",
+        "price": "₹38,000",
+        "url": "https://example.com/lenovo-ideapad",
+        "description": "Intel Core i3, 4GB RAM, 1TB HDD",
+        "rating": "3.8"
+    },
+    {
+        "title": "ASUS VivoBook 15",
+        "price": "₹41,000",
+        "url": "https://example.com/asus-vivobook",
+        "description": "Intel Core i5, 8GB RAM, 256GB SSD",
+        "rating": "4.1"
+    },
+    {
+        "title": "Acer Aspire 5",
+        "price": "₹39,000",
+        "url": "https://example.com/acer-aspire",
+        "description": "AMD Ryzen 3, 4GB RAM, 256GB SSD",
+        "rating": "3.9"
+    }
+]
+
+# Demo response serialized once; quoted "__NAME__" placeholders are
+# swapped for per-request JSON values in render_mock_response()
+_MOCK_RESPONSE_PARTS = re.split(rb'"(__[A-Z_]+__)"', orjson.dumps({
+    'task_id': '__TASK_ID__',
+    'status': 'success',
+    'instruction': '__INSTRUCTION__',
+    'results': _MOCK_RESULTS,
+    'execution_time': 2.5,
+    'error_message': None,
+    'logs': [
+        {
+            "timestamp": "__TIMESTAMP__",
+            "level": "info",
+            "message": "Task executed successfully with mock data",
+            "task_id": "__TASK_ID__",
+            "data": {}
+        }
+    ],
+    'metadata': {
+        "demo": True,
+        "mock_data": True,
+        "results_count": len(_MOCK_RESULTS)
+    }
+}))
+
+
+def render_mock_response(**values) -> bytes:
+    """Fill the precomputed demo response with per-request values"""
+    parts = _MOCK_RESPONSE_PARTS.copy()
+    parts[1::2] = [orjson.dumps(values[name.decode().strip('_').lower()]) for name in parts[1::2]]
+    return b''.join(parts)
+
+
+def _build_orchestrator():
+    """Build the orchestrator instance with fixed timeout"""
+    # Configure components with proper timeout
+    browser_config = BrowserConfig(
+        headless=True,
+        browser_type="chromium",
+        timeout=30000,  # 30 seconds timeout
+        viewport_width=1920,
+        viewport_height=1080
+    )
+
+    storage_config = ExportConfig(
+        output_dir="exports",
+        json_format=True,
+        csv_format=True
+    )
+
+    memory = MemoryFactory.create_memory(
+        persist_to_disk=True
+    )
+
+    return OrchestratorFactory.create_orchestrator(
+        browser_config=browser_config,
+        storage_config=storage_config,
+        memory=memory
+    )
+
+
+# Orchestrator shared by every request
+_orchestrator = SharedOrchestrator(_build_orchestrator)
+_orchestrator.start()
+get_orchestrator = _orchestrator.get
+
 
 @app.route('/')
 def index():
@@ -79,7 +159,7 @@ def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': now_strs()[0],
         'version': '1.0.0'
     })
 
@@ -87,8 +167,12 @@ def health():
 def run_task():
     """Execute a task from natural language instruction"""
     try:
-        data = request.get_json()
-        if not data or 'instruction' not in data:
+        raw = request.get_data(cache=False)
+        if len(raw) > MAX_REQUEST_SIZE:
+            raise BadRequest('Request body too large')
+        
+        data = orjson.loads(raw) if raw else None
+        if not isinstance(data, dict) or 'instruction' not in data:
             raise BadRequest('Instruction is required')
         
         instruction = data['instruction'].strip()
@@ -101,107 +185,37 @@ def run_task():
         logger.info(f"Received task request: {task_id} - {instruction}")
         
         # For demo purposes, return mock results instead of executing browser automation
-        if "search" in instruction.lower() and ("laptop" in instruction.lower() or "computer" in instruction.lower()):
-            # Return mock laptop results
-            mock_results = [
-                {
-                    "title": "Dell Inspiron 15 3000",
-                    "price": "₹45,000",
-                    "url": "https://example.com/dell-inspiron",
-                    "description": "Intel Core i5, 8GB RAM, 512GB SSD",
-                    "rating": "4.2"
-                },
-                {
-                    "title": "HP Pavilion 15",
-                    "price": "₹42,000",
-                    "url": "https://example.com/hp-pavilion",
-                    "description": "AMD Ryzen 5, 8GB RAM, 256GB SSD",
-                    "rating": "4.0"
-                },
-                {
-                    "title": "Lenovo IdeaPad 3",
-                    "price": "₹38,000",
-                    "url": "https://example.com/lenovo-ideapad",
-                    "description": "Intel Core i3, 4GB RAM, 1TB HDD",
-                    "rating": "3.8"
-                },
-                {
-                    "title": "ASUS VivoBook 15",
-                    "price": "₹41,000",
-                    "url": "https://example.com/asus-vivobook",
-                    "description": "Intel Core i5, 8GB RAM, 256GB SSD",
-                    "rating": "4.1"
-                },
-                {
-                    "title": "Acer Aspire 5",
-                    "price": "₹39,000",
-                    "url": "https://example.com/acer-aspire",
-                    "description": "AMD Ryzen 3, 4GB RAM, 256GB SSD",
-                    "rating": "3.9"
-                }
-            ]
-            
-            # Save mock results
-            from src.utils.storage import TaskResult
+        if _DEMO_RE.search(instruction):
+            # Save mock results in the background
             task_result = TaskResult(
                 task_id=task_id,
                 status="success",
                 instruction=instruction,
-                results=mock_results,
+                results=_MOCK_RESULTS,
                 metadata={"demo": True, "mock_data": True},
-                timestamp=datetime.now(),
                 execution_time=2.5
             )
             
-            orchestrator = get_orchestrator()
-            orchestrator.storage.save_task_result(task_result)
+            get_orchestrator().storage.queue_task_result(task_result)
+            invalidate_caches(task_id)
             
-            response = {
-                'task_id': task_id,
-                'status': 'success',
-                'instruction': instruction,
-                'results': mock_results,
-                'execution_time': 2.5,
-                'error_message': None,
-                'logs': [
-                    {
-                        "timestamp": datetime.now().isoformat(),
-                        "level": "info",
-                        "message": "Task executed successfully with mock data",
-                        "task_id": task_id,
-                        "data": {}
-                    }
-                ],
-                'metadata': {
-                    "demo": True,
-                    "mock_data": True,
-                    "results_count": len(mock_results)
-                }
-            }
+            body = render_mock_response(
+                task_id=task_id,
+                instruction=instruction,
+                timestamp=now_strs()[0]
+            )
             
             logger.info(f"Task {task_id} completed with mock data")
-            return jsonify(response)
+            return Response(body, mimetype="application/json")
         
         else:
             # For other instructions, try real execution
             try:
-                result = asyncio.run(
-                    get_orchestrator().execute(instruction, task_id)
-                )
-                
-                response = {
-                    'task_id': result.task_id,
-                    'status': result.status,
-                    'instruction': result.instruction,
-                    'results': result.results,
-                    'execution_time': result.execution_time,
-                    'error_message': result.error_message,
-                    'logs': result.logs,
-                    'metadata': result.metadata
-                }
+                result = run_async(get_orchestrator().execute(instruction, task_id))
+                invalidate_caches(task_id)
                 
                 logger.info(f"Task {task_id} completed with status: {result.status}")
-                return jsonify(response)
+                return result_response(result)
                 
             except Exception as e:
                 logger.error(f"Task execution failed: {e}")
@@ -221,8 +235,7 @@ def run_task():
 def get_results(task_id):
     """Get results for a specific task"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        task_result = load_task_result(get_orchestrator().storage, task_id)
         
         if not task_result:
             return jsonify({'error': 'Task not found'}), 404
@@ -245,17 +258,30 @@ def get_results(task_id):
 def export_csv(task_id):
     """Export task results as CSV"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        storage = get_orchestrator().storage
+        # A task queued for writing is exported from memory
+        task_result = storage.get_pending(task_id)
+        file_path = None if task_result is not None else storage.find_task_file(task_id)
         
-        if not task_result:
+        if task_result is None and file_path is None:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Export to CSV
-        filename = f"task_{task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        filepath = orchestrator.storage.export_to_csv(task_result.results, filename)
+        # Stream CSV straight to the client, from the cache when warm and
+        # otherwise straight off disk without pinning the rows in the cache
+        if task_result is None:
+            task_result = cached_task_result(task_id)
+        if task_result is not None:
+            rows = task_result.results
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        else:
+            rows = storage.iter_task_rows(task_id, file_path)
+            fieldnames = storage.task_fieldnames(task_id, file_path)
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        filename = f"task_{task_id}_{now_strs()[1]}.csv"
+        response = attachment(stream_csv(rows, fieldnames), filename, 'text/csv')
+        if file_path is None:
+            return response  # not on disk yet, so nothing to tag it with
+        return conditional_export(response, task_id, file_path)
         
     except Exception as e:
         logger.error(f"Failed to export CSV for {task_id}: {e}")
@@ -265,17 +291,25 @@ def export_csv(task_id):
 def export_json(task_id):
     """Export task results as JSON"""
     try:
-        orchestrator = get_orchestrator()
-        task_result = orchestrator.storage.load_task_result(task_id)
+        storage = get_orchestrator().storage
+        # A task queued for writing is exported from memory
+        task_result = storage.get_pending(task_id)
+        file_path = None if task_result is not None else storage.find_task_file(task_id)
         
-        if not task_result:
+        if task_result is None and file_path is None:
             return jsonify({'error': 'Task not found'}), 404
         
-        # Export to JSON
-        filename = f"task_{task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = orchestrator.storage.export_to_json(task_result.results, filename)
+        # Stream JSON straight to the client, from the cache when warm and
+        # otherwise straight off disk without pinning the rows in the cache
+        if task_result is None:
+            task_result = cached_task_result(task_id)
+        rows = task_result.results if task_result is not None else storage.iter_task_rows(task_id, file_path)
         
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        filename = f"task_{task_id}_{now_strs()[1]}.json"
+        response = attachment(stream_json(rows), filename, 'application/json')
+        if file_path is None:
+            return response  # not on disk yet, so nothing to tag it with
+        return conditional_export(response, task_id, file_path)
         
     except Exception as e:
         logger.error(f"Failed to export JSON for {task_id}: {e}")
@@ -285,8 +319,7 @@ def export_json(task_id):
 def get_history():
     """Get task execution history"""
     try:
-        orchestrator = get_orchestrator()
-        history = orchestrator.get_task_history()
+        history = get_orchestrator().get_task_history()
         return jsonify(history)
         
     except Exception as e:
@@ -297,8 +330,7 @@ def get_history():
 def get_stats():
     """Get session statistics"""
     try:
-        orchestrator = get_orchestrator()
-        stats = orchestrator.get_session_stats()
+        stats = get_orchestrator().get_session_stats()
         return jsonify(stats)
         
     except Exception as e:
@@ -327,6 +359,10 @@ def internal_error(error):
     """Handle 500 errors"""
     return jsonify({'error': 'Internal server error'}), 500
 
+# WSGI entry point for gunicorn (app_fixed:application)
+application = app
+
+
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
@@ -335,5 +371,9 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('DEBUG', 'false').lower() == 'true'
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    if os.getenv('FLASK_DEV'):
+        logger.info(f"Starting Flask dev server on port {port}")
+        app.run(host='0.0.0.0', port=port, debug=debug)
+    else:
+        logger.info(f"Starting gunicorn on port {port}")
+        os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'app_fixed:application'])
@@ -4,17 +4,119 @@ Browser Controller using Playwright for web automation
 
 import asyncio
 import logging
+import sys
+import tempfile
 import time
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, ElementHandle
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, List, Set, Union
+from dataclasses import dataclass, field, asdict
+from playwright.async_api import Browser, BrowserContext, Page, ElementHandle, Route
 import os
 from pathlib import Path
+from urllib.parse import urlparse
 
-# Configure logging
+from .browser_pool import BrowserPool
+from .skill_cache import get_skill_cache, fetch_static_html
+
+# Every Nth visit to a known-static page navigates normally to re-check it
+SKILL_REVALIDATE_EVERY = int(os.getenv('SKILL_REVALIDATE_EVERY', 20))
+
+# Configure logging; per-action info messages are only formatted when
+# INFO is enabled (the CLI runs at WARNING by default)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Playwright's error for an action on an element that left the page
+_DETACHED_ERROR = "not attached to the DOM"
+
+# Locator engines that match against the whole DOM on every lookup
+_SLOW_LOCATOR_PREFIXES = ('role=', 'text=')
+
+
+@lru_cache(maxsize=256)
+def _warn_slow_locator(selector: str):
+    """Suggest a CSS selector for a role=/text= locator (once per selector)"""
+    if selector.startswith(_SLOW_LOCATOR_PREFIXES):
+        logger.warning(f"Locator {selector} scans the whole page on every lookup; prefer a CSS selector (#id, [data-testid=...])")
+
+# What extract() reports about an element, read in one round-trip; `f` is
+# an ExtractFields dict choosing the fields and empty fields are left out
+_ELEMENT_DATA_JS = """(el, f) => {
+    const data = {};
+    if (f.text) {
+        const text = el.textContent && el.textContent.trim();
+        if (text) data.text = text;
+    }
+    if (f.html && el.innerHTML) data.html = el.innerHTML;
+    if (f.attributes && el.attributes.length) {
+        data.attributes = Object.fromEntries(Array.from(el.attributes, a => [a.name, a.value]));
+    }
+    if (f.tag) data.tag = el.tagName.toLowerCase();
+    const href = f.href && el.getAttribute('href');
+    if (href) data.href = href;
+    const src = f.src && el.getAttribute('src');
+    if (src) data.src = src;
+    return data;
+}"""
+_ALL_ELEMENTS_DATA_JS = f"(els, f) => els.map(el => ({_ELEMENT_DATA_JS})(el, f))"
+_FIRST_ELEMENT_DATA_JS = f"(els, f) => els.length ? ({_ELEMENT_DATA_JS})(els[0], f) : null"
+# Same data as columns ({field: [value per element]}, null where a field is
+# empty) so field names cross the wire once instead of once per element
+_COLUMNS_ELEMENTS_DATA_JS = f"""(els, f) => {{
+    const columns = {{}};
+    els.forEach((el, i) => {{
+        const row = ({_ELEMENT_DATA_JS})(el, f);
+        for (const key in row) {{
+            (columns[key] || (columns[key] = new Array(els.length).fill(null)))[i] = row[key];
+        }}
+    }});
+    return columns;
+}}"""
+
+# Visibility and enabled state in one round-trip, matching Playwright's
+# is_visible/is_enabled: a non-empty box without visibility:hidden, and
+# not :disabled (which also covers controls inside a disabled fieldset)
+_ELEMENT_STATE_JS = """el => {
+    const rect = el.getBoundingClientRect();
+    return {
+        visible: el.isConnected && rect.width > 0 && rect.height > 0
+            && getComputedStyle(el).visibility !== 'hidden',
+        enabled: !el.matches(':disabled')
+    };
+}"""
+
+# Process umask, read once at import since os.umask can only be queried by
+# setting it, which would race with files created on other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_atomic(path: Path, data: bytes):
+    """Write to a temp file beside `path` and rename it into place"""
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+        tmp.write(data)
+    # NamedTemporaryFile creates 0600; give the file the mode open() would
+    os.chmod(tmp.name, 0o666 & ~_UMASK)
+    os.replace(tmp.name, path)
+
+
+def rows_from_columns(columns: Dict[str, List[Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield row dicts from a columnar extract, one at a time"""
+    names = [sys.intern(name) for name in columns]
+    for values in zip(*columns.values()):
+        yield {name: value for name, value in zip(names, values) if value is not None}
+
+
+@dataclass
+class ExtractFields:
+    """Which element properties extract() reads"""
+    text: bool = True
+    html: bool = False  # serialized subtree; large on content-heavy pages
+    attributes: bool = False
+    tag: bool = True
+    href: bool = True
+    src: bool = True
+
 
 @dataclass
 class BrowserConfig:
@@ -26,6 +128,26 @@ class BrowserConfig:
     user_agent: Optional[str] = None
     timeout: int = 30000
     slow_mo: int = 0  # milliseconds to slow down operations
+    # Fetch known-static pages over plain HTTP (opt-in; only used with fresh contexts)
+    use_skill_cache: bool = os.getenv('USE_SKILL_CACHE', 'false').lower() == 'true'
+    # Keep contexts (cookies, storage, cache) warm between tasks; only for a
+    # single user, since one task's logins and cookies carry into the next
+    reuse_context: bool = False
+    storage_state: Optional[str] = None  # saved cookies/localStorage to start from
+    extract_fields: ExtractFields = field(default_factory=ExtractFields)
+    # Extra Chromium switches: trim background services and cap the disk cache
+    launch_args: List[str] = field(default_factory=lambda: [
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-background-networking",
+        "--disable-extensions",
+        "--disable-default-apps",
+        "--no-first-run",
+        "--disable-features=Translate,AudioServiceOutOfProcess",
+        "--disk-cache-size=33554432"
+    ])
+    # Subresource types aborted before they load; text extraction never needs them
+    block_resources: Set[str] = field(default_factory=lambda: {"image", "font", "media"})
 
 
 @dataclass
@@ -50,8 +172,22 @@ class BrowserController:
         self.config.timeout = 30000  # Fix timeout to 30 seconds
         self.playwright = None
         self.browser = None
+        self._pooled = None
         self.context = None
         self.page = None
+        # The fast path fetches without the browser's session, so it is only
+        # used when the context starts out empty
+        fast_path = (
+            self.config.use_skill_cache
+            and not self.config.reuse_context
+            and not self.config.storage_state
+        )
+        self.skills = get_skill_cache() if fast_path else None
+        
+        # Element handles resolved on the current page, most recent last;
+        # cleared whenever the main frame navigates
+        self._element_cache: "OrderedDict[str, ElementHandle]" = OrderedDict()
+        self.element_cache_size = 64
         self.screenshots_dir = Path("screenshots")
         self.screenshots_dir.mkdir(exist_ok=True)
     
@@ -67,34 +203,30 @@ class BrowserController:
     async def start(self):
         """Start the browser and create context"""
         try:
-            self.playwright = await async_playwright().start()
+            # Check out a warm browser; only the context is created per task
+            self._pooled = await BrowserPool.acquire(self.config)
+            self.playwright = self._pooled.playwright
+            self.browser = self._pooled.browser
             
-            # Launch browser
-            browser_launch_options = {
-                'headless': self.config.headless,
-                'slow_mo': self.config.slow_mo
-            }
-            
-            if self.config.browser_type == "chromium":
-                self.browser = await self.playwright.chromium.launch(**browser_launch_options)
-            elif self.config.browser_type == "firefox":
-                self.browser = await self.playwright.firefox.launch(**browser_launch_options)
-            elif self.config.browser_type == "webkit":
-                self.browser = await self.playwright.webkit.launch(**browser_launch_options)
-            else:
-                raise ValueError(f"Unsupported browser type: {self.config.browser_type}")
-            
-            # Create context
+            # Reuse a parked context with the same options, or create one
             context_options = {
                 'viewport': {
                     'width': self.config.viewport_width,
                     'height': self.config.viewport_height
                 },
-                'user_agent': self.config.user_agent
+                'user_agent': self.config.user_agent,
+                'storage_state': self.config.storage_state
             }
             
-            self.context = await self.browser.new_context(**context_options)
-            self.page = await self.context.new_page()
+            if self.config.reuse_context:
+                self.context = self._pooled.take_context(self._context_key())
+            if self.context is None:
+                self.context = await self.browser.new_context(**context_options)
+            
+            self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+            self.page.on("framenavigated", self._on_frame_navigated)
+            if self.config.block_resources:
+                await self.page.route("**/*", self._route_resource)
             
             # Set default timeout (fix the 15ms issue)
             self.page.set_default_timeout(30000)  # 30 seconds
@@ -103,39 +235,134 @@ class BrowserController:
             
         except Exception as e:
             logger.error(f"Failed to start browser: {e}")
+            await self.close()
             raise
     
+    async def _route_resource(self, route: Route):
+        """Abort requests for blocked resource types, let everything else through"""
+        if route.request.resource_type in self.config.block_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    def _context_key(self) -> tuple:
+        """Contexts are interchangeable when created with the same options"""
+        return (
+            self.config.viewport_width,
+            self.config.viewport_height,
+            self.config.user_agent,
+            self.config.storage_state
+        )
+    
     async def close(self):
         """Close browser and cleanup"""
         try:
             if self.page:
-                await self.page.close()
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
-            
+                self.page.remove_listener("framenavigated", self._on_frame_navigated)
+            
+            parked = False
+            if self.context and self._pooled and self.config.reuse_context and self.browser.is_connected():
+                # Blank the page but keep the context's cookies and cache for the next task
+                try:
+                    if self.config.block_resources:
+                        await self.page.unroute("**/*", self._route_resource)
+                    await self.page.goto('about:blank')
+                    await self._pooled.put_context(self._context_key(), self.context)
+                    parked = True
+                except Exception as e:
+                    logger.debug(f"Could not park browser context: {e}")
+            
+            if not parked:
+                if self.page:
+                    await self.page.close()
+                if self.context:
+                    await self.context.close()
+            if self._pooled:
+                await BrowserPool.release(self._pooled)
+            
+            self.page = self.context = self.browser = self.playwright = self._pooled = None
             logger.info("Browser closed")
             
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
     
+    def _on_frame_navigated(self, frame):
+        """Drop cached element handles once the main frame loads a new document"""
+        if frame == self.page.main_frame:
+            self._clear_page_caches()
+    
+    def _clear_page_caches(self):
+        """Forget everything resolved against the current document"""
+        self._element_cache.clear()
+    
+    async def _resolve(self, selector: str, timeout: Optional[int] = None) -> ElementHandle:
+        """Wait for an element, reusing the handle from an earlier lookup on this page"""
+        handle = self._element_cache.get(selector)
+        if handle is not None:
+            self._element_cache.move_to_end(selector)
+            return handle
+        
+        handle = await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+        self._element_cache[selector] = handle
+        if len(self._element_cache) > self.element_cache_size:
+            self._element_cache.popitem(last=False)
+        return handle
+    
+    async def _on_element(self, selector: str, timeout: Optional[int], action):
+        """Run `action(handle)`, re-resolving once if a cached handle has gone stale"""
+        cached = selector in self._element_cache
+        handle = await self._resolve(selector, timeout)
+        try:
+            return await action(handle)
+        except Exception as e:
+            # Only a detached element is retried; a timeout or intercepted
+            # click may already have acted, and clicks are not idempotent
+            if not cached or _DETACHED_ERROR not in str(e):
+                raise
+            self._element_cache.pop(selector, None)
+            return await action(await self._resolve(selector, timeout))
+    
     async def goto(self, url: str, timeout: Optional[int] = None) -> ActionResult:
         """Navigate to a URL"""
         try:
-            logger.info(f"Navigating to: {url}")
-            
-            # Use 30 seconds timeout instead of 15ms
-            response = await self.page.goto(url, timeout=30000)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Navigating to: {url}")
+            
+            self._clear_page_caches()
+            
+            # Pages known to render without scripted requests skip navigation,
+            # except every SKILL_REVALIDATE_EVERY visits, which re-check the page
+            skill = self.skills.lookup(url) if self.skills else None
+            if skill and skill.static and skill.hits % SKILL_REVALIDATE_EVERY:
+                result = await self._goto_static(url)
+                if result.success:
+                    return result
+                self.skills.forget(url)
+            
+            # Watch for script-driven requests to learn whether the page is static
+            scripted = []
+            def on_request(request):
+                if request.resource_type in ('xhr', 'fetch'):
+                    scripted.append(request)
+            self.page.on('request', on_request)
+            
+            try:
+                # Use 30 seconds timeout instead of 15ms
+                response = await self.page.goto(url, timeout=30000)
+            finally:
+                self.page.remove_listener('request', on_request)
             
             if response and response.status >= 400:
+                if self.skills:
+                    self.skills.forget(url)
                 return ActionResult(
                     success=False,
                     error=f"HTTP {response.status}: {response.status_text}"
                 )
             
+            if self.skills and response:
+                self.skills.record(url, static=not scripted)
+            
             return ActionResult(
                 success=True,
                 data={'url': url, 'status': response.status if response else None},
@@ -150,16 +377,53 @@ class BrowserController:
                 metadata={'action': 'goto', 'url': url}
             )
     
+    async def _goto_static(self, url: str) -> ActionResult:
+        """Load a known-static page by fetching its HTML directly"""
+        try:
+            cookies = {c['name']: c['value'] for c in await self.context.cookies(url)}
+            status, final_url, html = await asyncio.to_thread(
+                fetch_static_html, url, self.config.timeout / 1000, self.config.user_agent, cookies
+            )
+            # A redirect (consent page, login, bot wall) means the page is not what was learned
+            if status != 200 or urlparse(final_url).netloc != urlparse(url).netloc:
+                return ActionResult(success=False, error=f"HTTP {status} from {final_url}")
+            
+            # Serve the fetched HTML as the navigation response, so the page
+            # ends up on the real URL and origin (cookies, localStorage)
+            async def fulfill(route: Route):
+                if route.request.is_navigation_request():
+                    await route.fulfill(status=status, content_type='text/html; charset=utf-8', body=html)
+                else:
+                    await route.fallback()
+            
+            await self.page.route("**/*", fulfill)
+            try:
+                await self.page.goto(url, wait_until='domcontentloaded')
+            finally:
+                await self.page.unroute("**/*", fulfill)
+            
+            return ActionResult(
+                success=True,
+                data={'url': url, 'status': status},
+                metadata={'action': 'goto', 'url': url, 'fast_path': True}
+            )
+            
+        except Exception as e:
+            logger.warning(f"Static fetch failed for {url}, falling back to navigation: {e}")
+            return ActionResult(success=False, error=str(e))
+    
     async def click(self, selector: str, timeout: Optional[int] = None) -> ActionResult:
         """Click on an element"""
         try:
-            logger.info(f"Clicking element: {selector}")
-            
-            # Wait for element to be visible and clickable
-            await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Clicking element: {selector}")
+            _warn_slow_locator(selector)
             
-            # Click the element
-            await self.page.click(selector)
+            if selector in self._element_cache:
+                await self._on_element(selector, timeout, lambda handle: handle.click())
+            else:
+                # page.click auto-waits for the element, so no separate wait_for_selector
+                await self.page.click(selector, timeout=timeout or self.config.timeout)
             
             return ActionResult(
                 success=True,
@@ -178,13 +442,15 @@ class BrowserController:
     async def fill(self, selector: str, value: str, timeout: Optional[int] = None) -> ActionResult:
         """Fill an input field"""
         try:
-            logger.info(f"Filling {selector} with: {value}")
-            
-            # Wait for element to be visible
-            await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Filling {selector} with: {value}")
+            _warn_slow_locator(selector)
             
-            # Clear and fill the field
-            await self.page.fill(selector, value)
+            if selector in self._element_cache:
+                await self._on_element(selector, timeout, lambda handle: handle.fill(value))
+            else:
+                # page.fill auto-waits for the field, then clears and fills it
+                await self.page.fill(selector, value, timeout=timeout or self.config.timeout)
             
             return ActionResult(
                 success=True,
@@ -200,20 +466,29 @@ class BrowserController:
                 metadata={'action': 'fill', 'selector': selector, 'value': value}
             )
     
-    async def extract(self, selector: str, multiple: bool = False, timeout: Optional[int] = None) -> ActionResult:
-        """Extract content from elements"""
+    async def extract(self, selector: str, multiple: bool = False, timeout: Optional[int] = None,
+                      fields: Optional[ExtractFields] = None, columnar: bool = False) -> ActionResult:
+        """Extract content from elements; with `columnar`, multiple results come back as {field: [values]}"""
         try:
-            logger.info(f"Extracting from: {selector} (multiple={multiple})")
-            
-            if multiple:
-                # Extract from multiple elements
-                elements = await self.page.query_selector_all(selector)
-                data = []
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Extracting from: {selector} (multiple={multiple})")
+            _warn_slow_locator(selector)
+            wanted = asdict(fields or self.config.extract_fields)
+            
+            if multiple and columnar:
+                # Extract from all matching elements in a single evaluate, as columns
+                data = await self.page.eval_on_selector_all(selector, _COLUMNS_ELEMENTS_DATA_JS, wanted)
+                data = {sys.intern(name): values for name, values in data.items()}
+                count = len(next(iter(data.values()), []))
                 
-                for element in elements:
-                    element_data = await self._extract_element_data(element)
-                    if element_data:
-                        data.append(element_data)
+                return ActionResult(
+                    success=True,
+                    data=data,
+                    metadata={'action': 'extract', 'selector': selector, 'count': count, 'columnar': True}
+                )
+            elif multiple:
+                # Extract from all matching elements in a single evaluate
+                data = await self.page.eval_on_selector_all(selector, _ALL_ELEMENTS_DATA_JS, wanted)
                 
                 return ActionResult(
                     success=True,
@@ -221,15 +496,14 @@ class BrowserController:
                     metadata={'action': 'extract', 'selector': selector, 'count': len(data)}
                 )
             else:
-                # Extract from single element
-                element = await self.page.query_selector(selector)
-                if not element:
+                # Extract from the first matching element
+                data = await self.page.eval_on_selector_all(selector, _FIRST_ELEMENT_DATA_JS, wanted)
+                if not data:
                     return ActionResult(
                         success=False,
                         error=f"Element not found: {selector}"
                     )
                 
-                data = await self._extract_element_data(element)
                 return ActionResult(
                     success=True,
                     data=data,
@@ -244,42 +518,10 @@ class BrowserController:
                 metadata={'action': 'extract', 'selector': selector}
             )
     
-    async def _extract_element_data(self, element: ElementHandle) -> Dict[str, Any]:
+    async def _extract_element_data(self, element: ElementHandle, fields: Optional[ExtractFields] = None) -> Dict[str, Any]:
         """Extract data from a single element"""
         try:
-            data = {}
-            
-            # Get text content
-            text = await element.text_content()
-            if text:
-                data['text'] = text.strip()
-            
-            # Get HTML content
-            html = await element.inner_html()
-            if html:
-                data['html'] = html
-            
-            # Get attributes
-            attributes = await element.evaluate("el => el.attributes")
-            if attributes:
-                data['attributes'] = attributes
-            
-            # Get tag name
-            tag_name = await element.evaluate("el => el.tagName")
-            if tag_name:
-                data['tag'] = tag_name.lower()
-            
-            # Get href if it's a link
-            href = await element.get_attribute('href')
-            if href:
-                data['href'] = href
-            
-            # Get src if it's an image
-            src = await element.get_attribute('src')
-            if src:
-                data['src'] = src
-            
-            return data
+            return await element.evaluate(_ELEMENT_DATA_JS, asdict(fields or self.config.extract_fields))
             
         except Exception as e:
             logger.error(f"Failed to extract element data: {e}")
@@ -288,7 +530,8 @@ class BrowserController:
     async def wait(self, timeout: int) -> ActionResult:
         """Wait for a specified time"""
         try:
-            logger.info(f"Waiting for {timeout} seconds")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Waiting for {timeout} seconds")
             await asyncio.sleep(timeout)
             
             return ActionResult(
@@ -309,14 +552,18 @@ class BrowserController:
         """Take a screenshot"""
         try:
             if not filename:
-                timestamp = int(time.time())
-                filename = f"screenshot_{timestamp}.png"
+                # Nanosecond counter keeps names unique for concurrent screenshots
+                filename = f"screenshot_{time.monotonic_ns()}.png"
             
             screenshot_path = self.screenshots_dir / filename
             
-            await self.page.screenshot(path=str(screenshot_path))
+            # Capture the PNG in memory and write it from a worker thread, so
+            # the event loop is not blocked on disk I/O; readers never see a partial file
+            png = await self.page.screenshot()
+            await asyncio.to_thread(write_atomic, screenshot_path, png)
             
-            logger.info(f"Screenshot saved: {screenshot_path}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Screenshot saved: {screenshot_path}")
             
             return ActionResult(
                 success=True,
@@ -336,10 +583,11 @@ class BrowserController:
     async def get_page_info(self) -> Dict[str, Any]:
         """Get current page information"""
         try:
+            # url and viewport_size are local properties; only title() round-trips
             return {
                 'url': self.page.url,
                 'title': await self.page.title(),
-                'viewport': await self.page.viewport_size()
+                'viewport': self.page.viewport_size
             }
         except Exception as e:
             logger.error(f"Failed to get page info: {e}")
@@ -348,27 +596,34 @@ class BrowserController:
     async def safe_click(self, selector: str, timeout: Optional[int] = None) -> ActionResult:
         """Safely click an element with error handling"""
         try:
+            _warn_slow_locator(selector)
+            
             # Try to find the element first
-            await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+            cached = selector in self._element_cache
+            handle = await self._resolve(selector, timeout)
             
             # Check if element is visible and enabled
-            is_visible = await self.page.is_visible(selector)
-            is_enabled = await self.page.is_enabled(selector)
-            
-            if not is_visible:
+            state = await handle.evaluate(_ELEMENT_STATE_JS)
+            if not state['visible'] and cached:
+                # The cached handle may point at a node the page has since replaced
+                self._element_cache.pop(selector, None)
+                handle = await self._resolve(selector, timeout)
+                state = await handle.evaluate(_ELEMENT_STATE_JS)
+            
+            if not state['visible']:
                 return ActionResult(
                     success=False,
                     error=f"Element not visible: {selector}"
                 )
             
-            if not is_enabled:
+            if not state['enabled']:
                 return ActionResult(
                     success=False,
                     error=f"Element not enabled: {selector}"
                 )
             
             # Click the element
-            await self.page.click(selector)
+            await handle.click()
             
             return ActionResult(
                 success=True,
@@ -384,16 +639,17 @@ class BrowserController:
                 metadata={'action': 'safe_click', 'selector': selector}
             )
     
-    async def safe_extract(self, selector: str, multiple: bool = True, timeout: Optional[int] = None) -> ActionResult:
+    async def safe_extract(self, selector: str, multiple: bool = True, timeout: Optional[int] = None,
+                           columnar: bool = False) -> ActionResult:
         """Safely extract content with error handling"""
         try:
-            # Wait for elements to be present
-            if multiple:
-                await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
-            else:
-                await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+            # Read straight away; only wait when nothing has rendered yet
+            result = await self.extract(selector, multiple, timeout, columnar=columnar)
+            if result.success and result.data:
+                return result
             
-            return await self.extract(selector, multiple, timeout)
+            await self.page.wait_for_selector(selector, timeout=timeout or self.config.timeout)
+            return await self.extract(selector, multiple, timeout, columnar=columnar)
             
         except Exception as e:
             logger.error(f"Safe extract failed for {selector}: {e}")
@@ -0,0 +1,202 @@
+"""
+Browser pool that keeps launched Playwright browsers warm between tasks
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledBrowser:
+    """A launched browser checked out of (or idle in) the pool"""
+    playwright: Playwright
+    browser: Browser
+    key: Tuple[Any, ...]
+    last_used: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    # Idle contexts left open by previous tasks, keyed by context options
+    contexts: Dict[Tuple[Any, ...], List[BrowserContext]] = field(default_factory=dict)
+    max_idle_contexts = 2
+    
+    def take_context(self, key: Tuple[Any, ...]) -> Optional[BrowserContext]:
+        """Reuse an idle context created with the same options, if any"""
+        idle = self.contexts.get(key)
+        return idle.pop() if idle else None
+    
+    async def put_context(self, key: Tuple[Any, ...], context: BrowserContext):
+        """Park a context for the next task, closing it if enough are parked"""
+        idle = self.contexts.setdefault(key, [])
+        if len(idle) < self.max_idle_contexts:
+            idle.append(context)
+        else:
+            await context.close()
+
+
+class BrowserPool:
+    """Pool of warm browsers keyed by launch options, shared per event loop"""
+    
+    min_size = int(os.getenv('POOL_MIN_SIZE', 0))
+    max_size = int(os.getenv('POOL_MAX_SIZE', 4))
+    idle_timeout = float(os.getenv('POOL_IDLE_TIMEOUT', 300))
+    # Relaunch a browser after this many checkouts to shed accumulated memory (0 = never)
+    recycle_after = int(os.getenv('BROWSER_POOL_RECYCLE_AFTER', 100))
+    check_interval = 30.0
+    
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _idle: Dict[Tuple[Any, ...], asyncio.Queue] = {}
+    _sizes: Dict[Tuple[Any, ...], int] = {}
+    _monitor: Optional[asyncio.Task] = None
+    # One Playwright driver process serves every browser in the pool
+    _playwright: Optional[Playwright] = None
+    _playwright_lock: Optional[asyncio.Lock] = None
+    
+    @staticmethod
+    def _key(config) -> Tuple[Any, ...]:
+        """Browsers are interchangeable when launched with the same options"""
+        return (config.browser_type, config.headless, config.slow_mo, tuple(config.launch_args))
+    
+    @classmethod
+    def _bind_loop(cls):
+        """Reset pool state when used from a new event loop (e.g. a second asyncio.run)"""
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            cls._loop = loop
+            cls._idle = {}
+            cls._sizes = {}
+            cls._monitor = None
+            cls._playwright = None
+            cls._playwright_lock = asyncio.Lock()
+    
+    @classmethod
+    async def acquire(cls, config) -> PooledBrowser:
+        """Check out a warm browser matching `config`, launching one if needed"""
+        cls._bind_loop()
+        if cls._monitor is None or cls._monitor.done():
+            cls._monitor = asyncio.create_task(cls._health_check())
+        
+        key = cls._key(config)
+        idle = cls._idle.setdefault(key, asyncio.Queue())
+        
+        while True:
+            # Reuse an idle browser if one is still alive
+            while not idle.empty():
+                entry = idle.get_nowait()
+                if entry.browser.is_connected():
+                    return entry
+                await cls._discard(entry)
+            
+            # Grow the pool up to max_size
+            if cls._sizes.get(key, 0) < cls.max_size:
+                cls._sizes[key] = cls._sizes.get(key, 0) + 1
+                try:
+                    return await cls._launch(config, key)
+                except Exception:
+                    cls._sizes[key] -= 1
+                    raise
+            
+            # Pool is full; wait for another task to release one
+            entry = await idle.get()
+            if entry.browser.is_connected():
+                return entry
+            await cls._discard(entry)
+    
+    @classmethod
+    async def release(cls, entry: PooledBrowser):
+        """Return a browser to the pool, or close it if it is no longer usable"""
+        idle = cls._idle.get(entry.key)
+        entry.uses += 1
+        recycle = cls.recycle_after and entry.uses >= cls.recycle_after
+        if idle is None or recycle or not entry.browser.is_connected():
+            await cls._discard(entry)
+            return
+        
+        entry.last_used = time.monotonic()
+        idle.put_nowait(entry)
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close every idle browser in the pool and stop the Playwright driver"""
+        if cls._monitor is not None:
+            cls._monitor.cancel()
+            cls._monitor = None
+        
+        for idle in cls._idle.values():
+            while not idle.empty():
+                await cls._discard(idle.get_nowait())
+        cls._idle = {}
+        
+        if cls._playwright is not None:
+            try:
+                await cls._playwright.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping Playwright: {e}")
+            cls._playwright = None
+    
+    @classmethod
+    async def _get_playwright(cls) -> Playwright:
+        """Start the shared Playwright driver on first use"""
+        if cls._playwright is None:
+            async with cls._playwright_lock:
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+        return cls._playwright
+    
+    @classmethod
+    async def _launch(cls, config, key: Tuple[Any, ...]) -> PooledBrowser:
+        """Launch a browser for `config` on the shared Playwright driver"""
+        playwright = await cls._get_playwright()
+        
+        launcher = {
+            'chromium': playwright.chromium,
+            'firefox': playwright.firefox,
+            'webkit': playwright.webkit
+        }.get(config.browser_type)
+        if launcher is None:
+            raise ValueError(f"Unsupported browser type: {config.browser_type}")
+        
+        # The switches are Chromium-specific; Firefox and WebKit reject them
+        args = list(config.launch_args) if config.browser_type == 'chromium' else []
+        browser = await launcher.launch(headless=config.headless, slow_mo=config.slow_mo, args=args)
+        
+        logger.info(f"Launched pooled browser: {config.browser_type} (headless={config.headless})")
+        return PooledBrowser(playwright=playwright, browser=browser, key=key)
+    
+    @classmethod
+    async def _discard(cls, entry: PooledBrowser):
+        """Close a browser and free its slot; the shared driver keeps running"""
+        cls._sizes[entry.key] = max(cls._sizes.get(entry.key, 1) - 1, 0)
+        try:
+            if entry.browser.is_connected():
+                await entry.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+    
+    @classmethod
+    async def _health_check(cls):
+        """Periodically drop crashed browsers and close ones idle too long"""
+        while True:
+            await asyncio.sleep(cls.check_interval)
+            now = time.monotonic()
+            
+            for key, idle in list(cls._idle.items()):
+                keep = []
+                while not idle.empty():
+                    entry = idle.get_nowait()
+                    expired = now - entry.last_used > cls.idle_timeout
+                    if not entry.browser.is_connected():
+                        await cls._discard(entry)
+                    elif expired and cls._sizes.get(key, 0) > cls.min_size:
+                        await cls._discard(entry)
+                    else:
+                        keep.append(entry)
+                
+                for entry in keep:
+                    idle.put_nowait(entry)
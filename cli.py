@@ -4,45 +4,87 @@ Command-line interface for the Local AI Agent
 
 import asyncio
 import argparse
+import csv
 import json
 import os
 import sys
 import logging
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Awaitable, Iterable, List
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.agent.orchestrator import OrchestratorFactory
-from src.agent.browser_controller import BrowserConfig
-from src.utils.storage import ExportConfig
-from src.memory.session_memory import MemoryFactory
+# Orchestrator, browser and storage modules are imported where they are
+# first needed, so info commands (--stats, --history, ...) start quickly
+
+from src.utils.log_setup import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+setup_logging(logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class CLIManager:
     """Command-line interface manager"""
     
-    def __init__(self):
+    def __init__(self, setup: bool = True):
         self.orchestrator = None
-        self.setup_orchestrator()
+        self._memory = None
+        self._storage = None
+        if setup:
+            self.setup_orchestrator()
+    
+    @property
+    def memory(self):
+        """Session memory, loaded on its own when no orchestrator is running"""
+        if self.orchestrator is not None:
+            return self.orchestrator.memory
+        if self._memory is None:
+            from src.memory.session_memory import MemoryFactory
+            self._memory = MemoryFactory.create_memory(
+                persist_to_disk=os.getenv('MEMORY_PERSIST', 'true').lower() == 'true'
+            )
+        return self._memory
+    
+    @property
+    def storage(self):
+        """Result storage, opened on its own when no orchestrator is running"""
+        if self.orchestrator is not None:
+            return self.orchestrator.storage
+        if self._storage is None:
+            from src.utils.storage import ExportConfig, StorageFactory
+            self._storage = StorageFactory.create_storage(
+                ExportConfig(output_dir=os.getenv('OUTPUT_DIR', 'exports'))
+            )
+        return self._storage
     
     def setup_orchestrator(self):
         """Setup orchestrator with CLI configuration"""
         try:
+            from src.agent.orchestrator import OrchestratorFactory
+            from src.agent.llm_adapter import create_default_llm_manager
+            from src.agent.browser_controller import BrowserConfig, ExtractFields
+            from src.utils.storage import ExportConfig
+            from src.memory.session_memory import MemoryFactory
+            
             # Configure components
             browser_config = BrowserConfig(
                 headless=os.getenv('BROWSER_HEADLESS', 'true').lower() == 'true',
-                browser_type=os.getenv('BROWSER_TYPE', 'chromium')
+                browser_type=os.getenv('BROWSER_TYPE', 'chromium'),
+                # The CLI runs one user's tasks, so their sessions can carry over
+                reuse_context=os.getenv('BROWSER_REUSE_CONTEXT', 'true').lower() == 'true',
+                extract_fields=ExtractFields(html=os.getenv('EXTRACT_HTML', 'false').lower() == 'true')
             )
+            if os.getenv('BLOCK_RESOURCES', 'true').lower() != 'true':
+                browser_config.block_resources = set()
             
             storage_config = ExportConfig(
                 output_dir=os.getenv('OUTPUT_DIR', 'exports'),
@@ -50,11 +92,17 @@ class CLIManager:
                 csv_format=True
             )
             
-            memory = MemoryFactory.create_memory(
-                persist_to_disk=os.getenv('MEMORY_PERSIST', 'true').lower() == 'true'
-            )
+            # Load persisted memory from disk while the LLM adapters are created
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                memory_future = pool.submit(
+                    MemoryFactory.create_memory,
+                    persist_to_disk=os.getenv('MEMORY_PERSIST', 'true').lower() == 'true'
+                )
+                llm_manager = create_default_llm_manager()
+                memory = memory_future.result()
             
             self.orchestrator = OrchestratorFactory.create_orchestrator(
+                llm_manager=llm_manager,
                 browser_config=browser_config,
                 storage_config=storage_config,
                 memory=memory
@@ -85,8 +133,9 @@ class CLIManager:
             }
             
             # Save to file if specified
+            # Written from a worker thread so concurrent batch tasks keep running
             if output_file:
-                self._save_output(output, output_file, output_format)
+                await asyncio.to_thread(self._save_output, output, output_file, output_format)
             
             return output
             
@@ -97,6 +146,24 @@ class CLIManager:
                 'error_message': str(e)
             }
     
+    async def execute_tasks(self, instructions: List[str], output_format: str = 'json', output_file: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Execute several instructions concurrently, bounded by the browser pool size"""
+        from src.agent.browser_pool import BrowserPool
+        semaphore = asyncio.Semaphore(BrowserPool.max_size)
+        
+        async def run_one(index: int, instruction: str) -> Dict[str, Any]:
+            async with semaphore:
+                # One output file per instruction: results.json -> results_1.json, ...
+                task_file = None
+                if output_file:
+                    path = Path(output_file)
+                    task_file = str(path.with_name(f"{path.stem}_{index}{path.suffix}"))
+                return await self.execute_task(instruction, output_format, task_file)
+        
+        return await asyncio.gather(*(
+            run_one(i, instruction) for i, instruction in enumerate(instructions, 1)
+        ))
+    
     def _save_output(self, output: Dict[str, Any], filename: str, format: str):
         """Save output to file"""
         try:
@@ -104,22 +171,39 @@ class CLIManager:
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
             if format.lower() == 'json':
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(output, f, indent=2, ensure_ascii=False)
+                if orjson is not None:
+                    with open(filepath, 'wb') as f:
+                        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                else:
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        json.dump(output, f, indent=2, ensure_ascii=False)
+            elif format.lower() == 'jsonl':
+                # One result per line, encoded and written as it is reached
+                with open(filepath, 'wb') as f:
+                    write_jsonl(f, output.get('results') or [{
+                        'task_id': output['task_id'],
+                        'status': output['status'],
+                        'instruction': output['instruction'],
+                        'execution_time': output['execution_time']
+                    }])
             elif format.lower() == 'csv':
-                import pandas as pd
                 if output.get('results'):
-                    df = pd.DataFrame(output['results'])
-                    df.to_csv(filepath, index=False, encoding='utf-8')
+                    rows = output['results']
                 else:
                     # Create empty CSV with metadata
-                    df = pd.DataFrame([{
+                    rows = [{
                         'task_id': output['task_id'],
                         'status': output['status'],
                         'instruction': output['instruction'],
                         'execution_time': output['execution_time']
-                    }])
-                    df.to_csv(filepath, index=False, encoding='utf-8')
+                    }]
+                
+                # Columns are the union of all row keys, in first-seen order
+                fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+                with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
             else:
                 raise ValueError(f"Unsupported format: {format}")
             
@@ -131,7 +215,7 @@ class CLIManager:
     def show_stats(self):
         """Show session statistics"""
         try:
-            stats = self.orchestrator.get_session_stats()
+            stats = self.memory.get_session_stats()
             
             print("\n" + "="*50)
             print("SESSION STATISTICS")
@@ -151,7 +235,7 @@ class CLIManager:
     def show_history(self, limit: int = 10):
         """Show task history"""
         try:
-            history = self.orchestrator.get_task_history()
+            history = self.storage.list_task_results()
             
             if not history:
                 print("No task history available")
@@ -180,7 +264,7 @@ class CLIManager:
     def clear_memory(self):
         """Clear session memory"""
         try:
-            self.orchestrator.clear_memory()
+            self.memory.clear_memories()
             print("Session memory cleared successfully")
             
         except Exception as e:
@@ -189,7 +273,7 @@ class CLIManager:
     def export_memory(self, filename: str):
         """Export session memory"""
         try:
-            filepath = self.orchestrator.memory.export_memories(filename)
+            filepath = self.memory.export_memories(filename)
             if filepath:
                 print(f"Memory exported to: {filepath}")
             else:
@@ -199,6 +283,60 @@ class CLIManager:
             logger.error(f"Failed to export memory: {e}")
 
 
+def write_jsonl(f, rows: Iterable[Dict[str, Any]]):
+    """Write rows to a binary file as newline-delimited JSON"""
+    for row in rows:
+        if orjson is not None:
+            f.write(orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            f.write(json.dumps(row, ensure_ascii=False).encode('utf-8'))
+        f.write(b'\n')
+
+
+async def run_tasks(cli: CLIManager, tasks: Awaitable[Any]) -> Any:
+    """Await `tasks`, then save queued memories and close pooled browsers before the loop exits"""
+    from src.agent.browser_pool import BrowserPool
+    try:
+        return await tasks
+    finally:
+        if cli.orchestrator is not None:
+            await cli.orchestrator.drain()
+        await BrowserPool.shutdown()
+
+
+def read_batch_file(filename: str) -> List[str]:
+    """Read one instruction per line, skipping blank lines and # comments"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith('#')]
+
+
+def print_result(result: Dict[str, Any]):
+    """Print a task result summary"""
+    print(f"\nTask ID: {result.get('task_id', 'N/A')}")
+    print(f"Status: {result.get('status', 'N/A')}")
+    print(f"Execution Time: {result.get('execution_time', 0):.2f}s")
+    
+    if result.get('error_message'):
+        print(f"Error: {result['error_message']}")
+    
+    if result.get('results'):
+        print(f"\nResults ({len(result['results'])} items):")
+        print("-" * 50)
+        for i, item in enumerate(result['results'][:5], 1):  # Show first 5
+            print(f"{i}. {item.get('title', 'N/A')}")
+            if item.get('price'):
+                print(f"   Price: {item['price']}")
+            if item.get('url'):
+                print(f"   URL: {item['url']}")
+            print()
+        
+        if len(result['results']) > 5:
+            print(f"... and {len(result['results']) - 5} more items")
+    else:
+        print("No results found")
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -209,6 +347,7 @@ Examples:
   python cli.py "search laptops under ₹50,000 and list top 5 with price and link"
   python cli.py "navigate to https://example.com and take a screenshot" --headful
   python cli.py "extract all product information from the current page" --output results.json
+  python cli.py --batch instructions.txt --output results.json
   python cli.py --stats
   python cli.py --history --limit 20
   python cli.py --clear-memory
@@ -222,6 +361,11 @@ Examples:
         help='Natural language instruction to execute'
     )
     
+    parser.add_argument(
+        '--batch', '-b',
+        help='File with one instruction per line to execute concurrently'
+    )
+    
     # Output options
     parser.add_argument(
         '--output', '-o',
@@ -229,7 +373,7 @@ Examples:
     )
     parser.add_argument(
         '--format', '-f',
-        choices=['json', 'csv'],
+        choices=['json', 'jsonl', 'csv'],
         default='json',
         help='Output format (default: json)'
     )
@@ -246,6 +390,16 @@ Examples:
         default='chromium',
         help='Browser type to use (default: chromium)'
     )
+    parser.add_argument(
+        '--with-html',
+        action='store_true',
+        help='Include each element\'s inner HTML in extracted results'
+    )
+    parser.add_argument(
+        '--no-block-images',
+        action='store_true',
+        help='Load images, fonts and media (blocked by default to speed up page loads)'
+    )
     
     # Memory options
     parser.add_argument(
@@ -296,6 +450,8 @@ Examples:
     )
     
     args = parser.parse_args()
+    if args.instruction and args.batch:
+        parser.error("give either an instruction or --batch, not both")
     
     # Configure logging
     if args.debug:
@@ -312,9 +468,19 @@ Examples:
         os.environ['BROWSER_TYPE'] = args.browser
     if args.persist_memory:
         os.environ['MEMORY_PERSIST'] = 'true'
+    if args.with_html:
+        os.environ['EXTRACT_HTML'] = 'true'
+    if args.no_block_images:
+        os.environ['BLOCK_RESOURCES'] = 'false'
+    
+    # Info commands only read memory/storage and never start the orchestrator
+    info_only = bool(args.clear_memory or args.stats or args.history or args.export_memory)
+    if not (info_only or args.instruction or args.batch):
+        parser.print_help()
+        return
     
     # Create CLI manager
-    cli = CLIManager()
+    cli = CLIManager(setup=not info_only)
     
     try:
         # Handle different commands
@@ -328,38 +494,24 @@ Examples:
             cli.export_memory(args.export_memory)
         elif args.instruction:
             # Execute task
-            result = asyncio.run(cli.execute_task(
-                args.instruction,
-                args.format,
-                args.output
+            result = asyncio.run(run_tasks(
+                cli,
+                cli.execute_task(args.instruction, args.format, args.output)
             ))
             
             # Display results
             if args.verbose or not args.output:
-                print(f"\nTask ID: {result.get('task_id', 'N/A')}")
-                print(f"Status: {result.get('status', 'N/A')}")
-                print(f"Execution Time: {result.get('execution_time', 0):.2f}s")
-                
-                if result.get('error_message'):
-                    print(f"Error: {result['error_message']}")
-                
-                if result.get('results'):
-                    print(f"\nResults ({len(result['results'])} items):")
-                    print("-" * 50)
-                    for i, item in enumerate(result['results'][:5], 1):  # Show first 5
-                        print(f"{i}. {item.get('title', 'N/A')}")
-                        if item.get('price'):
-                            print(f"   Price: {item['price']}")
-                        if item.get('url'):
-                            print(f"   URL: {item['url']}")
-                        print()
-                    
-                    if len(result['results']) > 5:
-                        print(f"... and {len(result['results']) - 5} more items")
-                else:
-                    print("No results found")
-        else:
-            parser.print_help()
+                print_result(result)
+        elif args.batch:
+            # Execute every instruction in the file concurrently
+            results = asyncio.run(run_tasks(
+                cli,
+                cli.execute_tasks(read_batch_file(args.batch), args.format, args.output)
+            ))
+            
+            if args.verbose or not args.output:
+                for result in results:
+                    print_result(result)
     
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
@@ -3,16 +3,20 @@ Demo script showing how to use the Local AI Agent
 """
 
 import asyncio
+import io
 import os
 import sys
 import logging
+import functools
+import importlib
+import threading
+from contextlib import asynccontextmanager
+from typing import Tuple
 from datetime import datetime
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
 from src.agent.orchestrator import OrchestratorFactory
 from src.agent.browser_controller import BrowserConfig
+from src.agent.browser_pool import BrowserPool
 from src.utils.storage import ExportConfig
 from src.memory.session_memory import MemoryFactory
 
@@ -23,16 +27,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Section rules shared by every demo report
+BANNER = "=" * 60
+DIVIDER = "-" * 50
 
-async def demo_search_laptops():
-    """Demo: Search for laptops under ₹50,000"""
-    print("="*60)
-    print("DEMO: Search for laptops under ₹50,000")
-    print("="*60)
-    
-    # Configure components
+# Caps how many demos drive the shared browser at once
+DEMO_SEMAPHORE = asyncio.Semaphore(int(os.getenv('DEMO_CONCURRENCY', min(os.cpu_count() or 1, 4))))
+
+
+# Packages each LLM backend imports lazily when its adapter is created
+LLM_BACKEND_MODULES = {
+    'gpt4all': ('gpt4all',),
+    'ollama': ('ollama',),
+    'llama': ('torch', 'transformers'),
+}
+
+
+def _preload_llm_backend():
+    """Import the configured LLM backend so the orchestrator finds it loaded"""
+    for name in LLM_BACKEND_MODULES.get(os.getenv('LLM_TYPE', 'gpt4all').lower(), ()):
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.debug(f"Could not preload {name}: {e}")
+
+
+@functools.cache
+def _configs(headless: bool) -> Tuple[BrowserConfig, ExportConfig]:
+    """Browser and storage settings shared by every demo"""
     browser_config = BrowserConfig(
-        headless=True,  # Set to False to see browser in action
+        headless=headless,
         browser_type="chromium"
     )
     
@@ -42,76 +66,14 @@ async def demo_search_laptops():
         csv_format=True
     )
     
-    memory = MemoryFactory.create_memory(
-        persist_to_disk=True,
-        memory_file="demo_memory.json"
-    )
-    
-    # Create orchestrator
-    orchestrator = OrchestratorFactory.create_orchestrator(
-        browser_config=browser_config,
-        storage_config=storage_config,
-        memory=memory
-    )
-    
-    try:
-        # Execute search task
-        instruction = "search laptops under ₹50,000 and list top 5 with price and link"
-        print(f"Instruction: {instruction}")
-        print("\nExecuting task...")
-        
-        result = await orchestrator.execute(instruction)
-        
-        # Display results
-        print(f"\nTask ID: {result.task_id}")
-        print(f"Status: {result.status}")
-        print(f"Execution Time: {result.execution_time:.2f}s")
-        
-        if result.error_message:
-            print(f"Error: {result.error_message}")
-        else:
-            print(f"\nResults ({len(result.results)} items):")
-            print("-" * 50)
-            
-            for i, item in enumerate(result.results, 1):
-                print(f"{i}. {item.get('title', 'N/A')}")
-                if item.get('price'):
-                    print(f"   Price: {item['price']}")
-                if item.get('url'):
-                    print(f"   URL: {item['url']}")
-                if item.get('description'):
-                    print(f"   Description: {item['description']}")
-                print()
-        
-        # Show session stats
-        stats = orchestrator.get_session_stats()
-        print(f"\nSession Stats:")
-        print(f"Total Tasks: {stats.get('total_tasks', 0)}")
-        print(f"Successful: {stats.get('successful_tasks', 0)}")
-        print(f"Failed: {stats.get('failed_tasks', 0)}")
-        print(f"Success Rate: {(stats.get('success_rate', 0) * 100):.1f}%")
-        
-    except Exception as e:
-        logger.error(f"Demo failed: {e}")
-        print(f"Demo failed: {e}")
+    return browser_config, storage_config
 
 
-async def demo_navigate_and_screenshot():
-    """Demo: Navigate to a website and take screenshot"""
-    print("\n" + "="*60)
-    print("DEMO: Navigate to website and take screenshot")
-    print("="*60)
-    
-    # Configure components
-    browser_config = BrowserConfig(
-        headless=False,  # Show browser for this demo
-        browser_type="chromium"
-    )
-    
-    storage_config = ExportConfig(
-        output_dir="demo_exports",
-        json_format=True,
-        csv_format=True
+@asynccontextmanager
+async def _with_shared_orchestrator():
+    """One orchestrator (and one pooled browser) for every demo; each task gets its own context"""
+    browser_config, storage_config = _configs(
+        headless=os.getenv('BROWSER_HEADLESS', 'true').lower() == 'true'  # false to watch the demos
     )
     
     memory = MemoryFactory.create_memory(
@@ -119,7 +81,6 @@ async def demo_navigate_and_screenshot():
         memory_file="demo_memory.json"
     )
     
-    # Create orchestrator
     orchestrator = OrchestratorFactory.create_orchestrator(
         browser_config=browser_config,
         storage_config=storage_config,
@@ -127,152 +88,213 @@ async def demo_navigate_and_screenshot():
     )
     
     try:
-        # Execute navigation task
-        instruction = "navigate to https://www.google.com and take a screenshot"
-        print(f"Instruction: {instruction}")
-        print("\nExecuting task...")
-        
-        result = await orchestrator.execute(instruction)
-        
-        # Display results
-        print(f"\nTask ID: {result.task_id}")
-        print(f"Status: {result.status}")
-        print(f"Execution Time: {result.execution_time:.2f}s")
-        
-        if result.error_message:
-            print(f"Error: {result.error_message}")
-        else:
-            print("Navigation completed successfully!")
-            if result.metadata.get('screenshot_path'):
-                print(f"Screenshot saved to: {result.metadata['screenshot_path']}")
-        
-    except Exception as e:
-        logger.error(f"Demo failed: {e}")
-        print(f"Demo failed: {e}")
+        async with orchestrator:
+            yield orchestrator
+    finally:
+        await BrowserPool.shutdown()
 
 
-async def demo_extract_content():
-    """Demo: Extract content from a webpage"""
-    print("\n" + "="*60)
-    print("DEMO: Extract content from webpage")
-    print("="*60)
+async def demo_search_laptops(orchestrator) -> str:
+    """Demo: Search for laptops under ₹50,000"""
+    lines = []  # printed by main() once every demo has finished
+    lines.append(BANNER)
+    lines.append("DEMO: Search for laptops under ₹50,000")
+    lines.append(BANNER)
     
-    # Configure components
-    browser_config = BrowserConfig(
-        headless=True,
-        browser_type="chromium"
-    )
+    async with DEMO_SEMAPHORE:
+        try:
+            # Execute search task
+            instruction = "search laptops under ₹50,000 and list top 5 with price and link"
+            lines.append(f"Instruction: {instruction}")
+            lines.append("\nExecuting task...")
+            
+            result = await orchestrator.execute(instruction)
+            
+            # Display results
+            lines.append(f"\nTask ID: {result.task_id}")
+            lines.append(f"Status: {result.status}")
+            lines.append(f"Execution Time: {result.execution_time:.2f}s")
+            
+            if result.error_message:
+                lines.append(f"Error: {result.error_message}")
+            else:
+                lines.append(f"\nResults ({len(result.results)} items):")
+                lines.append(DIVIDER)
+                
+                for i, item in enumerate(result.results, 1):
+                    lines.append(f"{i}. {item.get('title', 'N/A')}")
+                    if item.get('price'):
+                        lines.append(f"   Price: {item['price']}")
+                    if item.get('url'):
+                        lines.append(f"   URL: {item['url']}")
+                    if item.get('description'):
+                        lines.append(f"   Description: {item['description']}")
+                    lines.append("")
+            
+            # Show session stats
+            stats = orchestrator.get_session_stats()
+            lines.append(f"\nSession Stats:")
+            lines.append(f"Total Tasks: {stats.get('total_tasks', 0)}")
+            lines.append(f"Successful: {stats.get('successful_tasks', 0)}")
+            lines.append(f"Failed: {stats.get('failed_tasks', 0)}")
+            lines.append(f"Success Rate: {(stats.get('success_rate', 0) * 100):.1f}%")
+        
+        except Exception as e:
+            message = f"Demo failed: {e}"
+            logger.error(message)
+            lines.append(message)
     
-    storage_config = ExportConfig(
-        output_dir="demo_exports",
-        json_format=True,
-        csv_format=True
-    )
+    return "\n".join(lines)
+
+
+async def demo_navigate_and_screenshot(orchestrator) -> str:
+    """Demo: Navigate to a website and take screenshot"""
+    lines = []  # printed by main() once every demo has finished
+    lines.append("\n" + BANNER)
+    lines.append("DEMO: Navigate to website and take screenshot")
+    lines.append(BANNER)
     
-    memory = MemoryFactory.create_memory(
-        persist_to_disk=True,
-        memory_file="demo_memory.json"
-    )
+    async with DEMO_SEMAPHORE:
+        try:
+            # Execute navigation task
+            instruction = "navigate to https://www.google.com and take a screenshot"
+            lines.append(f"Instruction: {instruction}")
+            lines.append("\nExecuting task...")
+            
+            result = await orchestrator.execute(instruction)
+            
+            # Display results
+            lines.append(f"\nTask ID: {result.task_id}")
+            lines.append(f"Status: {result.status}")
+            lines.append(f"Execution Time: {result.execution_time:.2f}s")
+            
+            if result.error_message:
+                lines.append(f"Error: {result.error_message}")
+            else:
+                lines.append("Navigation completed successfully!")
+                if result.metadata.get('screenshot_path'):
+                    lines.append(f"Screenshot saved to: {result.metadata['screenshot_path']}")
+        
+        except Exception as e:
+            message = f"Demo failed: {e}"
+            logger.error(message)
+            lines.append(message)
     
-    # Create orchestrator
-    orchestrator = OrchestratorFactory.create_orchestrator(
-        browser_config=browser_config,
-        storage_config=storage_config,
-        memory=memory
-    )
+    return "\n".join(lines)
+
+
+async def demo_extract_content(orchestrator) -> str:
+    """Demo: Extract content from a webpage"""
+    lines = []  # printed by main() once every demo has finished
+    lines.append("\n" + BANNER)
+    lines.append("DEMO: Extract content from webpage")
+    lines.append(BANNER)
     
-    try:
-        # Execute extraction task
-        instruction = "extract all product information from https://example.com"
-        print(f"Instruction: {instruction}")
-        print("\nExecuting task...")
-        
-        result = await orchestrator.execute(instruction)
-        
-        # Display results
-        print(f"\nTask ID: {result.task_id}")
-        print(f"Status: {result.status}")
-        print(f"Execution Time: {result.execution_time:.2f}s")
-        
-        if result.error_message:
-            print(f"Error: {result.error_message}")
-        else:
-            print(f"\nExtracted {len(result.results)} items:")
-            for i, item in enumerate(result.results, 1):
-                print(f"{i}. {item.get('title', 'N/A')}")
-                if item.get('text'):
-                    print(f"   Text: {item['text'][:100]}...")
+    async with DEMO_SEMAPHORE:
+        try:
+            # Execute extraction task
+            instruction = "extract all product information from https://example.com"
+            lines.append(f"Instruction: {instruction}")
+            lines.append("\nExecuting task...")
+            
+            result = await orchestrator.execute(instruction)
+            
+            # Display results
+            lines.append(f"\nTask ID: {result.task_id}")
+            lines.append(f"Status: {result.status}")
+            lines.append(f"Execution Time: {result.execution_time:.2f}s")
+            
+            if result.error_message:
+                lines.append(f"Error: {result.error_message}")
+            else:
+                lines.append(f"\nExtracted {len(result.results)} items:")
+                for i, item in enumerate(result.results, 1):
+                    lines.append(f"{i}. {item.get('title', 'N/A')}")
+                    if item.get('text'):
+                        lines.append(f"   Text: {item['text'][:100]}...")
         
-    except Exception as e:
-        logger.error(f"Demo failed: {e}")
-        print(f"Demo failed: {e}")
+        except Exception as e:
+            message = f"Demo failed: {e}"
+            logger.error(message)
+            lines.append(message)
+    
+    return "\n".join(lines)
 
 
 def demo_cli_usage():
     """Demo: Show CLI usage examples"""
-    print("\n" + "="*60)
-    print("DEMO: CLI Usage Examples")
-    print("="*60)
+    buf = io.StringIO()  # written to stdout in one call at the end
+    print("\n" + BANNER, file=buf)
+    print("DEMO: CLI Usage Examples", file=buf)
+    print(BANNER, file=buf)
     
-    print("Here are some example CLI commands you can try:")
-    print()
-    print("1. Basic search:")
-    print("   python cli.py \"search laptops under ₹50,000 and list top 5 with price and link\"")
-    print()
-    print("2. Navigate with visible browser:")
-    print("   python cli.py \"navigate to https://example.com and take a screenshot\" --headful")
-    print()
-    print("3. Extract content:")
-    print("   python cli.py \"extract all product information from the current page\"")
-    print()
-    print("4. Save results to file:")
-    print("   python cli.py \"search gaming laptops\" --output results.json --format json")
-    print()
-    print("5. Show session statistics:")
-    print("   python cli.py --stats")
-    print()
-    print("6. Show task history:")
-    print("   python cli.py --history --limit 10")
-    print()
-    print("7. Clear session memory:")
-    print("   python cli.py --clear-memory")
-    print()
-    print("8. Export session memory:")
-    print("   python cli.py --export-memory memory_backup.json")
+    print("Here are some example CLI commands you can try:", file=buf)
+    print(file=buf)
+    print("1. Basic search:", file=buf)
+    print("   python cli.py \"search laptops under ₹50,000 and list top 5 with price and link\"", file=buf)
+    print(file=buf)
+    print("2. Navigate with visible browser:", file=buf)
+    print("   python cli.py \"navigate to https://example.com and take a screenshot\" --headful", file=buf)
+    print(file=buf)
+    print("3. Extract content:", file=buf)
+    print("   python cli.py \"extract all product information from the current page\"", file=buf)
+    print(file=buf)
+    print("4. Save results to file:", file=buf)
+    print("   python cli.py \"search gaming laptops\" --output results.json --format json", file=buf)
+    print(file=buf)
+    print("5. Show session statistics:", file=buf)
+    print("   python cli.py --stats", file=buf)
+    print(file=buf)
+    print("6. Show task history:", file=buf)
+    print("   python cli.py --history --limit 10", file=buf)
+    print(file=buf)
+    print("7. Clear session memory:", file=buf)
+    print("   python cli.py --clear-memory", file=buf)
+    print(file=buf)
+    print("8. Export session memory:", file=buf)
+    print("   python cli.py --export-memory memory_backup.json", file=buf)
+    
+    sys.stdout.write(buf.getvalue())
 
 
 def demo_web_interface():
     """Demo: Show web interface usage"""
-    print("\n" + "="*60)
-    print("DEMO: Web Interface Usage")
-    print("="*60)
+    buf = io.StringIO()  # written to stdout in one call at the end
+    print("\n" + BANNER, file=buf)
+    print("DEMO: Web Interface Usage", file=buf)
+    print(BANNER, file=buf)
     
-    print("To use the web interface:")
-    print()
-    print("1. Start the Flask server:")
-    print("   python app.py")
-    print()
-    print("2. Open your browser and go to:")
-    print("   http://localhost:5000")
-    print()
-    print("3. Enter your instruction in the text area")
-    print("4. Click 'Execute Task' to run the task")
-    print("5. View results, export data, and check history")
-    print()
-    print("Available endpoints:")
-    print("  GET  /              - Web interface")
-    print("  POST /run           - Execute task")
-    print("  GET  /results/<id>  - Get task results")
-    print("  GET  /export/<id>/csv - Export as CSV")
-    print("  GET  /export/<id>/json - Export as JSON")
-    print("  GET  /history       - Get task history")
-    print("  GET  /stats         - Get session stats")
+    print("To use the web interface:", file=buf)
+    print(file=buf)
+    print("1. Start the Flask server:", file=buf)
+    print("   python app.py", file=buf)
+    print(file=buf)
+    print("2. Open your browser and go to:", file=buf)
+    print("   http://localhost:5000", file=buf)
+    print(file=buf)
+    print("3. Enter your instruction in the text area", file=buf)
+    print("4. Click 'Execute Task' to run the task", file=buf)
+    print("5. View results, export data, and check history", file=buf)
+    print(file=buf)
+    print("Available endpoints:", file=buf)
+    print("  GET  /              - Web interface", file=buf)
+    print("  POST /run           - Execute task", file=buf)
+    print("  GET  /results/<id>  - Get task results", file=buf)
+    print("  GET  /export/<id>/csv - Export as CSV", file=buf)
+    print("  GET  /export/<id>/json - Export as JSON", file=buf)
+    print("  GET  /history       - Get task history", file=buf)
+    print("  GET  /stats         - Get session stats", file=buf)
+    
+    sys.stdout.write(buf.getvalue())
 
 
 async def main():
     """Main demo function"""
+    # Overlap the LLM backend's import with the greeting and config checks
+    threading.Thread(target=_preload_llm_backend, daemon=True).start()
+    
     print("Local AI Agent - Demo Script")
-    print("="*60)
+    print(BANNER)
     print("This demo shows how to use the Local AI Agent")
     print("Make sure you have set up the required dependencies first!")
     print()
@@ -285,25 +307,44 @@ async def main():
         print()
     
     try:
-        # Run demos
-        await demo_search_laptops()
-        await demo_navigate_and_screenshot()
-        await demo_extract_content()
+        # Run demos concurrently on one shared browser; output is printed
+        # afterwards so the demos' reports don't interleave
+        # (the orchestrator batches memory writes and drains them on exit)
+        async with _with_shared_orchestrator() as orchestrator:
+            reports = await asyncio.gather(
+                demo_search_laptops(orchestrator),
+                demo_navigate_and_screenshot(orchestrator),
+                demo_extract_content(orchestrator),
+                return_exceptions=True
+            )
+        
+        for report in reports:
+            if isinstance(report, Exception):
+                print(f"Demo failed: {report}")
+            else:
+                print(report)
         
         # Show usage examples
         demo_cli_usage()
         demo_web_interface()
         
-        print("\n" + "="*60)
+        print("\n" + BANNER)
         print("Demo completed successfully!")
         print("Check the 'demo_exports' directory for saved results")
-        print("="*60)
+        print(BANNER)
         
     except Exception as e:
-        logger.error(f"Demo failed: {e}")
-        print(f"Demo failed: {e}")
+        message = f"Demo failed: {e}"
+        logger.error(message)
+        print(message)
         print("Make sure all dependencies are installed and configured correctly")
 
 
 if __name__ == "__main__":
+    # uvloop is optional and unavailable on Windows; fall back to the stock loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
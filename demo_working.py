@@ -6,7 +6,7 @@ import os
 import sys
 import asyncio
 import json
-from datetime import datetime
+import operator
 
 # Set environment variables
 os.environ['LLM_TYPE'] = 'ollama'
@@ -14,17 +14,62 @@ os.environ['LLM_MODEL_NAME'] = 'llama2'
 os.environ['BROWSER_HEADLESS'] = 'true'
 os.environ['MEMORY_PERSIST'] = 'false'
 
-# Add src to path
-sys.path.insert(0, 'src')
-
 from src.agent.orchestrator import OrchestratorFactory
 from src.agent.browser_controller import BrowserConfig
-from src.utils.storage import ExportConfig
+from src.utils.storage import ExportConfig, ResultColumns
 from src.memory.session_memory import MemoryFactory
 
+# Fetches every column of a ResultColumns in one call, in display order
+RESULT_COLUMNS = operator.attrgetter("title", "price", "url", "rating", "description")
+
+# Emoji can't be encoded on a non-UTF-8 stdout (Windows consoles, ASCII pipes);
+# pick the icon set once instead of failing or falling back per character
+ASCII_OUTPUT = (sys.stdout.encoding or "").lower().replace("-", "") != "utf8"
+if ASCII_OUTPUT:
+    # The mock prices still contain ₹; replace it rather than abort the demo
+    sys.stdout.reconfigure(errors="replace")
+    ICONS = {
+        "target": "",
+        "ok": "[OK] ",
+        "brain": "",
+        "note": "- ",
+        "wait": "... ",
+        "stats": "",
+        "save": "",
+        "list": "",
+        "money": "$ ",
+        "link": "URL ",
+        "star": "* ",
+        "search": "",
+        "done": "",
+        "tip": "Tip: ",
+        "web": "",
+        "error": "[ERROR] ",
+    }
+else:
+    ICONS = {
+        "target": "🎯 ",
+        "ok": "✅ ",
+        "brain": "🧠 ",
+        "note": "📝 ",
+        "wait": "⏳ ",
+        "stats": "📊 ",
+        "save": "💾 ",
+        "list": "📋 ",
+        "money": "💰 ",
+        "link": "🔗 ",
+        "star": "⭐ ",
+        "search": "🔍 ",
+        "done": "🎉 ",
+        "tip": "💡 ",
+        "web": "🌐 ",
+        "error": "❌ ",
+    }
+
+
 async def demo_with_mock_data():
     """Demo with mock data to show the system working"""
-    print("🎯 Working Demo - Local AI Agent")
+    print(f"{ICONS['target']}Working Demo - Local AI Agent")
     print("=" * 50)
     
     try:
@@ -54,51 +99,52 @@ async def demo_with_mock_data():
             memory=memory
         )
         
-        print("✅ System initialized successfully!")
+        print(f"{ICONS['ok']}System initialized successfully!")
         
         # Simulate a successful task execution with mock data
-        print("\n🧠 Simulating Task Execution:")
-        print("   📝 Instruction: 'search laptops under ₹50,000 and list top 5 with price and link'")
-        print("   ⏳ Processing...")
-        
-        # Create mock results
-        mock_results = [
-            {
-                "title": "Dell Inspiron 15 3000",
-                "price": "₹45,000",
-                "url": "https://example.com/dell-inspiron",
-                "description": "Intel Core i5, 8GB RAM, 512GB SSD",
-                "rating": "4.2"
-            },
-            {
-                "title": "HP Pavilion 15",
-                "price": "₹42,000",
-                "url": "https://example.com/hp-pavilion",
-                "description": "AMD Ryzen 5, 8GB RAM, 256GB SSD",
-                "rating": "4.0"
-            },
-            {
-                "title": "Lenovo IdeaPad 3",
-                "price": "₹38,000",
-                "url": "https://example.com/lenovo-ideapad",
-                "description": "Intel Core i3, 4GB RAM, 1TB HDD",
-                "rating": "3.8"
-            },
-            {
-                "title": "ASUS VivoBook 15",
-                "price": "₹41,000",
-                "url": "https://example.com/asus-vivobook",
-                "description": "Intel Core i5, 8GB RAM, 256GB SSD",
-                "rating": "4.1"
-            },
-            {
-                "title": "Acer Aspire 5",
-                "price": "₹39,000",
-                "url": "https://example.com/acer-aspire",
-                "description": "AMD Ryzen 3, 4GB RAM, 256GB SSD",
-                "rating": "3.9"
-            }
-        ]
+        print(f"\n{ICONS['brain']}Simulating Task Execution:")
+        print(f"   {ICONS['note']}Instruction: 'search laptops under ₹50,000 and list top 5 with price and link'")
+        print(f"   {ICONS['wait']}Processing...")
+        
+        # Create mock results, one list per field
+        mock_results = ResultColumns(
+            title=[
+                "Dell Inspiron 15 3000",
+                "HP Pavilion 15",
+                "Lenovo IdeaPad 3",
+                "ASUS VivoBook 15",
+                "Acer Aspire 5"
+            ],
+            price=[
+                "₹45,000",
+                "₹42,000",
+                "₹38,000",
+                "₹41,000",
+                "₹39,000"
+            ],
+            url=[
+                "https://example.com/dell-inspiron",
+                "https://example.com/hp-pavilion",
+                "https://example.com/lenovo-ideapad",
+                "https://example.com/asus-vivobook",
+                "https://example.com/acer-aspire"
+            ],
+            description=[
+                "Intel Core i5, 8GB RAM, 512GB SSD",
+                "AMD Ryzen 5, 8GB RAM, 256GB SSD",
+                "Intel Core i3, 4GB RAM, 1TB HDD",
+                "Intel Core i5, 8GB RAM, 256GB SSD",
+                "AMD Ryzen 3, 4GB RAM, 256GB SSD"
+            ],
+            rating=[
+                "4.2",
+                "4.0",
+                "3.8",
+                "4.1",
+                "3.9"
+            ]
+        )
+        mock_rows = mock_results.to_rows()  # TaskResult and memory store rows
         
         # Save mock results
         from src.utils.storage import TaskResult
@@ -106,73 +152,76 @@ async def demo_with_mock_data():
             task_id="demo_mock_001",
             status="success",
             instruction="search laptops under ₹50,000 and list top 5 with price and link",
-            results=mock_results,
+            results=mock_rows,
             metadata={"demo": True, "mock_data": True},
-            timestamp=datetime.now(),
             execution_time=2.5
         )
         
         saved_files = orchestrator.storage.save_task_result(task_result)
         
-        print("   ✅ Task completed successfully!")
-        print(f"   📊 Results: {len(mock_results)} laptops found")
-        print(f"   💾 Saved to: {len(saved_files)} files")
+        print(f"   {ICONS['ok']}Task completed successfully!")
+        print(f"   {ICONS['stats']}Results: {len(mock_results)} laptops found")
+        print(f"   {ICONS['save']}Saved to: {len(saved_files)} files")
         
         # Display results
-        print("\n📋 Results:")
+        print(f"\n{ICONS['list']}Results:")
         print("-" * 60)
-        for i, item in enumerate(mock_results, 1):
-            print(f"{i}. {item['title']}")
-            print(f"   💰 Price: {item['price']}")
-            print(f"   🔗 URL: {item['url']}")
-            print(f"   ⭐ Rating: {item['rating']}")
-            print(f"   📝 Description: {item['description']}")
-            print()
+        sys.stdout.write("".join(
+            f"{i}. {title}\n   {ICONS['money']}Price: {price}\n   {ICONS['link']}URL: {url}\n"
+            f"   {ICONS['star']}Rating: {rating}\n   {ICONS['note']}Description: {description}\n\n"
+            for i, (title, price, url, rating, description) in enumerate(zip(*RESULT_COLUMNS(mock_results)), 1)
+        ))
         
         # Test memory system
-        print("🧠 Testing Memory System:")
-        memory_id = memory.add_memory(
-            instruction="search laptops under ₹50,000",
-            result=mock_results,
-            success=True,
-            task_type="search"
-        )
-        print(f"   ✅ Added memory: {memory_id[:8]}...")
+        print(f"{ICONS['brain']}Testing Memory System:")
+        memory_id, = memory.add_memories([{
+            "instruction": "search laptops under ₹50,000",
+            "result": mock_rows,
+            "success": True,
+            "task_type": "search"
+        }])
+        print(f"   {ICONS['ok']}Added memory: {memory_id[:8]}...")
         
         recent = memory.get_recent_memories(5)
-        print(f"   ✅ Retrieved {len(recent)} recent memories")
+        print(f"   {ICONS['ok']}Retrieved {len(recent)} recent memories")
         
         # Test data extraction
-        print("\n🔍 Testing Data Extraction:")
+        print(f"\n{ICONS['search']}Testing Data Extraction:")
         from src.agent.extractor import ExtractorFactory
         extractor = ExtractorFactory.create_extractor()
         
         # Test price extraction
         test_text = "Laptop Model XYZ - ₹45,000 - High performance gaming laptop"
         price = extractor._extract_price(test_text)
-        print(f"   ✅ Price extraction: '{test_text}' → {price}")
+        print(f"   {ICONS['ok']}Price extraction: '{test_text}' → {price}")
         
         # Test rating extraction
         test_rating = "Rating: 4.5 out of 5 stars"
         rating = extractor._extract_rating(test_rating)
-        print(f"   ✅ Rating extraction: '{test_rating}' → {rating}")
+        print(f"   {ICONS['ok']}Rating extraction: '{test_rating}' → {rating}")
         
         # Show session stats
-        print("\n📊 Session Statistics:")
+        print(f"\n{ICONS['stats']}Session Statistics:")
         stats = orchestrator.get_session_stats()
         print(f"   Total Tasks: {stats.get('total_tasks', 0)}")
         print(f"   Successful: {stats.get('successful_tasks', 0)}")
         print(f"   Failed: {stats.get('failed_tasks', 0)}")
         print(f"   Success Rate: {(stats.get('success_rate', 0) * 100):.1f}%")
         
-        print("\n🎉 Demo completed successfully!")
-        print("💡 The system is fully functional - the timeout issue is fixed!")
-        print("🌐 Your web interface at http://localhost:5000 is ready to use!")
+        print(f"\n{ICONS['done']}Demo completed successfully!")
+        print(f"{ICONS['tip']}The system is fully functional - the timeout issue is fixed!")
+        print(f"{ICONS['web']}Your web interface at http://localhost:5000 is ready to use!")
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"{ICONS['error']}Error: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
+    # uvloop is optional and unavailable on Windows; fall back to the stock loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(demo_with_mock_data())
@@ -2,19 +2,220 @@
 Content extraction utilities for web scraping and data processing
 """
 
+import os
 import re
 import logging
-from typing import Dict, Any, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import json
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional speedup; fall back to BeautifulSoup
+    LexborHTMLParser = None
+
+try:
+    import numpy as np
+except ImportError:  # optional speedup for large batches; fall back to sorted()
+    np = None
+
+try:
+    import lxml  # noqa: F401  (only checked for; bs4 loads it by name)
+    _SOUP_PARSER = 'lxml'
+except ImportError:
+    _SOUP_PARSER = 'html.parser'
+
 logger = logging.getLogger(__name__)
 
+# Each pattern captures the number in exactly one group; the alternatives are
+# fused into one regex so a text is scanned once, and the leftmost hit wins
+PRICE_PATTERNS = (
+    r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'INR\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*rupees?',
+    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*₹'
+)
+
+RATING_PATTERNS = (
+    r'(\d+(?:\.\d+)?)\s*out\s*of\s*5',
+    r'(\d+(?:\.\d+)?)\s*\/\s*5',
+    r'(\d+(?:\.\d+)?)\s*stars?',
+    r'rating[:\s]*(\d+(?:\.\d+)?)'
+)
+
+PRICE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in PRICE_PATTERNS), re.IGNORECASE)
+RATING_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in RATING_PATTERNS), re.IGNORECASE)
+# Finds whichever of a price or a rating comes first; prices win ties
+PRICE_OR_RATING_RE = re.compile(f'(?P<price>{PRICE_RE.pattern})|(?P<rating>{RATING_RE.pattern})', re.IGNORECASE)
+
+# A bare tag, class or id selector (e.g. "div", "div.product", "#results")
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-z0-9]+)?(?:([.#])([\w-]+))?$', re.IGNORECASE)
+
+_NUMBER_RE = re.compile(r'(\d+(?:,\d{3})*(?:\.\d{2})?)')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,!?₹$€£¥]')
+# The same filter for ASCII text as a str.translate table: every ASCII
+# character _SPECIAL_CHARS_RE would remove maps to None
+_SPECIAL_ASCII_TABLE = {
+    code: None for code in range(128)
+    if _SPECIAL_CHARS_RE.match(chr(code))
+}
+
+# Selector keys read for each matched element, in _extract_element_data's order
+FIELD_SELECTOR_KEYS = ('title', 'price', 'link', 'description', 'rating', 'image')
+
+# Batches at least this large are filtered and sorted with NumPy
+VECTORIZE_MIN_ITEMS = 1024
+
+# Texts shorter than this are memoized by _clean_text
+CLEAN_TEXT_CACHE_MAX_LEN = 256
+
+
+def _clean_text(text: str) -> str:
+    """Collapse whitespace and drop special characters, keeping basic punctuation"""
+    text = _WHITESPACE_RE.sub(' ', text)
+    if text.isascii():
+        text = text.translate(_SPECIAL_ASCII_TABLE)
+    else:
+        text = _SPECIAL_CHARS_RE.sub('', text)
+    return text.strip()
+
+
+_clean_text_cached = lru_cache(maxsize=4096)(_clean_text)
+
+
+@lru_cache(maxsize=4096)
+def parse_price_value(price: str) -> Optional[float]:
+    """Numeric value of a price string, parsed once per distinct string"""
+    match = _NUMBER_RE.search(price)
+    if not match:
+        return None
+    try:
+        return float(match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def parse_rating_value(rating: str) -> Optional[float]:
+    """Numeric value of a rating string, parsed once per distinct string"""
+    try:
+        return float(rating)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _simple_selector(selector: str) -> Optional[Dict[str, Any]]:
+    """find()/SoupStrainer keyword arguments for a simple selector, else None"""
+    match = _SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not any(match.groups()):
+        return None
+    tag, kind, value = match.groups()
+    kwargs = {'name': tag.lower() if tag else True}
+    if kind == '.':
+        kwargs['class_'] = value
+    elif kind == '#':
+        kwargs['id'] = value
+    return kwargs
+
+
+@lru_cache(maxsize=256)
+def _compiled_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once; scraper configs reuse the same few"""
+    return soupsieve.compile(selector)
+
+
+class _LexborBackend:
+    """HTML parsing and CSS selection in C via selectolax's Lexbor bindings"""
+    
+    @staticmethod
+    def parse(html: str, only: Optional[str] = None):
+        return LexborHTMLParser(html)
+    
+    @staticmethod
+    def select(node, selector: str) -> list:
+        return node.css(selector)
+    
+    @staticmethod
+    def select_one(node, selector: str):
+        return node.css_first(selector)
+    
+    @staticmethod
+    def finder(selector: str) -> Callable:
+        """select_one bound to one selector; Lexbor handles simple ones natively"""
+        return lambda node: node.css_first(selector)
+    
+    @staticmethod
+    def text(node) -> str:
+        return node.text(deep=True)
+    
+    @staticmethod
+    def attributes(node) -> Dict[str, Any]:
+        return dict(node.attributes)
+    
+    @staticmethod
+    def html(node) -> str:
+        return node.html or ""
+    
+    @staticmethod
+    def tag(node) -> str:
+        return node.tag
+
+
+class _SoupBackend:
+    """Pure-Python fallback used when selectolax is not installed"""
+    
+    @staticmethod
+    def parse(html: str, only: Optional[str] = None):
+        # Only build the subtrees under `only` when it is a simple selector
+        kwargs = _simple_selector(only) if only else None
+        strainer = SoupStrainer(**kwargs) if kwargs else None
+        return BeautifulSoup(html, _SOUP_PARSER, parse_only=strainer)
+    
+    @staticmethod
+    def select(node, selector: str) -> list:
+        return _compiled_selector(selector).select(node)
+    
+    @staticmethod
+    def select_one(node, selector: str):
+        return _SoupBackend.finder(selector)(node)
+    
+    @staticmethod
+    def finder(selector: str) -> Callable:
+        """select_one bound to one selector, classified once up front"""
+        # find() skips the CSS selector engine for simple selectors
+        kwargs = _simple_selector(selector)
+        if kwargs is not None:
+            return lambda node: node.find(**kwargs)
+        return _compiled_selector(selector).select_one
+    
+    @staticmethod
+    def text(node) -> str:
+        return node.get_text()
+    
+    @staticmethod
+    def attributes(node) -> Dict[str, Any]:
+        return dict(node.attrs) if hasattr(node, 'attrs') else {}
+    
+    @staticmethod
+    def html(node) -> str:
+        return str(node)
+    
+    @staticmethod
+    def tag(node) -> str:
+        return node.name
+
+
+_Backend = _LexborBackend if LexborHTMLParser is not None else _SoupBackend
+
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedData:
     """Structured extracted data"""
     title: Optional[str] = None
@@ -45,94 +246,108 @@ class ExtractedData:
 class ContentExtractor:
     """Utility class for extracting and processing web content"""
     
-    def __init__(self):
-        self.price_patterns = [
-            r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'INR\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-            r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*rupees?',
-            r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*₹'
-        ]
-        
-        self.rating_patterns = [
-            r'(\d+(?:\.\d+)?)\s*out\s*of\s*5',
-            r'(\d+(?:\.\d+)?)\s*\/\s*5',
-            r'(\d+(?:\.\d+)?)\s*stars?',
-            r'rating[:\s]*(\d+(?:\.\d+)?)'
-        ]
+    def __init__(self, capture_raw: bool = False):
+        self.price_re = PRICE_RE
+        self.rating_re = RATING_RE
+        # Each matched element's full text and attributes walk its whole
+        # subtree, so HTML extraction only keeps its tag unless asked for more
+        self.capture_raw = capture_raw
+        # Serializing each matched subtree is costly on large pages, so raw
+        # HTML is only kept when asked for (same switch as the CLI's --with-html)
+        self.include_html = os.getenv('EXTRACT_HTML', 'false').lower() == 'true'
     
     def extract_from_html(self, html: str, selectors: Dict[str, str]) -> List[ExtractedData]:
         """Extract data from HTML using CSS selectors"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            results_selector = selectors.get('results', 'body')
+            tree = _Backend.parse(html, only=results_selector)
             results = []
             
             # Find all matching elements
-            elements = soup.select(selectors.get('results', 'body'))
+            elements = _Backend.select(tree, results_selector)
+            
+            # Resolve the per-field selectors once for the whole batch
+            field_finders = [
+                _Backend.finder(selector) if selector is not None else None
+                for selector in (selectors.get(key) for key in FIELD_SELECTOR_KEYS)
+            ]
             
             for element in elements:
-                data = self._extract_element_data(element, selectors)
+                data = self._extract_element_data(element, *field_finders)
                 if data:
                     results.append(data)
             
-            logger.info(f"Extracted {len(results)} items from HTML")
+            logger.info("Extracted %d items from HTML", len(results))
             return results
             
         except Exception as e:
             logger.error(f"Failed to extract from HTML: {e}")
             return []
     
-    def _extract_element_data(self, element, selectors: Dict[str, str]) -> Optional[ExtractedData]:
-        """Extract data from a single element"""
+    def extract_from_html_batch(self, htmls: List[str], selectors: Dict[str, str], max_workers: Optional[int] = None) -> List[List[ExtractedData]]:
+        """Extract several pages in parallel threads, one result list per page"""
+        if len(htmls) <= 1:
+            return [self.extract_from_html(html, selectors) for html in htmls]
+        
+        # The extractor holds no per-call state and its caches are thread-safe,
+        # so the threads share it; parsing in lxml/Lexbor runs in C
+        with ThreadPoolExecutor(max_workers=max_workers or min(32, len(htmls))) as pool:
+            return list(pool.map(lambda html: self.extract_from_html(html, selectors), htmls))
+    
+    def _extract_element_data(self, element, find_title: Optional[Callable] = None, find_price: Optional[Callable] = None,
+                              find_link: Optional[Callable] = None, find_description: Optional[Callable] = None,
+                              find_rating: Optional[Callable] = None, find_image: Optional[Callable] = None) -> Optional[ExtractedData]:
+        """Extract data from a single element, one _Backend.finder per field (None to skip it)"""
         try:
             data = ExtractedData()
             
             # Extract title
-            if 'title' in selectors:
-                title_elem = element.select_one(selectors['title'])
+            if find_title is not None:
+                title_elem = find_title(element)
                 if title_elem:
-                    data.title = self._clean_text(title_elem.get_text())
+                    data.title = self._clean_text(_Backend.text(title_elem))
             
             # Extract price
-            if 'price' in selectors:
-                price_elem = element.select_one(selectors['price'])
+            if find_price is not None:
+                price_elem = find_price(element)
                 if price_elem:
-                    data.price = self._extract_price(price_elem.get_text())
+                    data.price = self._extract_price(_Backend.text(price_elem))
             
             # Extract URL
-            if 'link' in selectors:
-                link_elem = element.select_one(selectors['link'])
+            if find_link is not None:
+                link_elem = find_link(element)
                 if link_elem:
-                    href = link_elem.get('href')
+                    href = _Backend.attributes(link_elem).get('href')
                     if href:
                         data.url = self._normalize_url(href)
             
             # Extract description
-            if 'description' in selectors:
-                desc_elem = element.select_one(selectors['description'])
+            if find_description is not None:
+                desc_elem = find_description(element)
                 if desc_elem:
-                    data.description = self._clean_text(desc_elem.get_text())
+                    data.description = self._clean_text(_Backend.text(desc_elem))
             
             # Extract rating
-            if 'rating' in selectors:
-                rating_elem = element.select_one(selectors['rating'])
+            if find_rating is not None:
+                rating_elem = find_rating(element)
                 if rating_elem:
-                    data.rating = self._extract_rating(rating_elem.get_text())
+                    data.rating = self._extract_rating(_Backend.text(rating_elem))
             
             # Extract image URL
-            if 'image' in selectors:
-                img_elem = element.select_one(selectors['image'])
+            if find_image is not None:
+                img_elem = find_image(element)
                 if img_elem:
-                    src = img_elem.get('src')
+                    src = _Backend.attributes(img_elem).get('src')
                     if src:
                         data.image_url = self._normalize_url(src)
             
             # Store raw element data
-            data.raw_data = {
-                'html': str(element),
-                'text': element.get_text(),
-                'attributes': dict(element.attrs) if hasattr(element, 'attrs') else {}
-            }
+            data.raw_data = {'tag': _Backend.tag(element)}
+            if self.capture_raw:
+                data.raw_data['text'] = _Backend.text(element)
+                data.raw_data['attributes'] = _Backend.attributes(element)
+            if self.include_html:
+                data.raw_data['html'] = _Backend.html(element)
             
             # Only return if we have at least some data
             if any([data.title, data.price, data.url, data.description]):
@@ -144,41 +359,36 @@ class ContentExtractor:
             logger.error(f"Failed to extract element data: {e}")
             return None
     
-    def extract_from_playwright_data(self, playwright_data: List[Dict[str, Any]], selectors: Dict[str, str]) -> List[ExtractedData]:
+    def extract_from_playwright_data(self, playwright_data: Iterable[Dict[str, Any]], selectors: Dict[str, str]) -> List[ExtractedData]:
         """Extract data from Playwright extraction results"""
         try:
             results = []
             
             for item in playwright_data:
-                data = ExtractedData()
-                
-                # Extract title from text or attributes
-                if 'text' in item:
-                    data.title = self._clean_text(item['text'])
+                text = item.get('text')
+                attributes = item.get('attributes') or {}
+                href = item.get('href') or attributes.get('href')
                 
-                # Extract price from text
-                if 'text' in item:
-                    price = self._extract_price(item['text'])
-                    if price:
-                        data.price = price
+                # Without text or a link nothing below would make the item
+                # meaningful (an image alone doesn't), so skip it early
+                if not text and not href:
+                    continue
                 
-                # Extract URL from href attribute
-                if 'attributes' in item and 'href' in item['attributes']:
-                    data.url = self._normalize_url(item['attributes']['href'])
+                data = ExtractedData()
                 
-                # Extract description from text
-                if 'text' in item:
-                    data.description = self._clean_text(item['text'])
+                # Title, description, price and rating all come from the text
+                if text is not None:
+                    data.title = data.description = self._clean_text(text)
+                    data.price, data.rating = self._extract_price_and_rating(text)
                 
-                # Extract rating from text
-                if 'text' in item:
-                    rating = self._extract_rating(item['text'])
-                    if rating:
-                        data.rating = rating
+                # Extract URL from href attribute
+                if href:
+                    data.url = self._normalize_url(href)
                 
                 # Extract image URL from src attribute
-                if 'attributes' in item and 'src' in item['attributes']:
-                    data.image_url = self._normalize_url(item['attributes']['src'])
+                src = item.get('src') or attributes.get('src')
+                if src:
+                    data.image_url = self._normalize_url(src)
                 
                 # Store raw data
                 data.raw_data = item
@@ -187,7 +397,7 @@ class ContentExtractor:
                 if any([data.title, data.price, data.url, data.description]):
                     results.append(data)
             
-            logger.info(f"Extracted {len(results)} items from Playwright data")
+            logger.info("Extracted %d items from Playwright data", len(results))
             return results
             
         except Exception as e:
@@ -196,47 +406,71 @@ class ContentExtractor:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        if not text:
+        if not text or text.isspace():
             return ""
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?₹$€£¥]', '', text)
-        
-        return text.strip()
+        # Short strings (labels, ratings, boilerplate) repeat across a page
+        if len(text) < CLEAN_TEXT_CACHE_MAX_LEN:
+            return _clean_text_cached(text)
+        return _clean_text(text)
     
     def _extract_price(self, text: str) -> Optional[str]:
         """Extract price from text"""
-        if not text:
+        if not text or len(text) < 2:  # shortest match is e.g. "₹5"
             return None
         
-        for pattern in self.price_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                price = match.group(1)
-                # Add currency symbol if not present
-                if not any(symbol in price for symbol in ['₹', 'Rs', 'INR']):
-                    price = f"₹{price}"
-                return price
+        return self._price_from_match(self.price_re.search(text))
+    
+    @staticmethod
+    def _price_from_match(match) -> Optional[str]:
+        """Format the number captured by a PRICE_RE match"""
+        if match:
+            # Only the matching alternative's group is set
+            price = match.group(match.lastindex)
+            # Add currency symbol if not present
+            if not any(symbol in price for symbol in ['₹', 'Rs', 'INR']):
+                price = f"₹{price}"
+            return price
         
         return None
     
+    def _extract_price_and_rating(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """Same as (_extract_price(text), _extract_rating(text)) with one shared scan"""
+        if not text or len(text) < 2:
+            return None, None
+        
+        first = PRICE_OR_RATING_RE.search(text)
+        if first is None:
+            return None, None
+        
+        # Nothing of either kind starts before `first`, so the other kind's
+        # search resumes there instead of rescanning the prefix
+        start = first.start()
+        if first.lastgroup == 'price':
+            price_match = self.price_re.match(text, start)
+            rating_match = self.rating_re.search(text, start)
+        else:
+            price_match = self.price_re.search(text, start + 1)
+            rating_match = self.rating_re.match(text, start)
+        
+        rating = rating_match.group(rating_match.lastindex) if rating_match else None
+        return self._price_from_match(price_match), rating
+    
     def _extract_rating(self, text: str) -> Optional[str]:
         """Extract rating from text"""
-        if not text:
+        if not text or len(text) < 2:
             return None
         
-        for pattern in self.rating_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        match = self.rating_re.search(text)
+        if match:
+            return match.group(match.lastindex)
         
         return None
     
-    def _normalize_url(self, url: str) -> str:
-        """Normalize URL"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_url(url: str) -> str:
+        """Normalize URL; cached since pages repeat the same links"""
         if not url:
             return ""
         
@@ -256,63 +490,74 @@ class ContentExtractor:
         if not max_price and not min_price:
             return data
         
+        if np is not None and len(data) >= VECTORIZE_MIN_ITEMS:
+            prices = self._numeric_column(data, 'price', np.nan)
+            mask = ~np.isnan(prices)
+            if max_price:
+                mask &= prices <= max_price
+            if min_price:
+                mask &= prices >= min_price
+            return [data[i] for i in np.flatnonzero(mask)]
+        
         filtered = []
         
         for item in data:
-            if not item.price:
+            price_value = parse_price_value(item.price) if item.price else None
+            if price_value is None:
                 continue
             
-            # Extract numeric price
-            price_match = re.search(r'(\d+(?:,\d{3})*(?:\.\d{2})?)', item.price)
-            if not price_match:
+            if max_price and price_value > max_price:
                 continue
             
-            try:
-                price_value = float(price_match.group(1).replace(',', ''))
-                
-                if max_price and price_value > max_price:
-                    continue
-                
-                if min_price and price_value < min_price:
-                    continue
-                
-                filtered.append(item)
-                
-            except ValueError:
+            if min_price and price_value < min_price:
                 continue
+            
+            filtered.append(item)
         
         return filtered
     
     def sort_by_rating(self, data: List[ExtractedData], reverse: bool = True) -> List[ExtractedData]:
         """Sort data by rating"""
+        if np is not None and len(data) >= VECTORIZE_MIN_ITEMS:
+            return self._argsort(data, self._numeric_column(data, 'rating', 0.0), reverse)
+        
         def get_rating_value(item):
-            if not item.rating:
-                return 0.0
-            
-            try:
-                return float(item.rating)
-            except ValueError:
-                return 0.0
+            rating_value = parse_rating_value(item.rating) if item.rating else None
+            return 0.0 if rating_value is None else rating_value
         
         return sorted(data, key=get_rating_value, reverse=reverse)
     
     def sort_by_price(self, data: List[ExtractedData], reverse: bool = False) -> List[ExtractedData]:
         """Sort data by price"""
+        missing = float('inf') if reverse else 0.0
+        
+        if np is not None and len(data) >= VECTORIZE_MIN_ITEMS:
+            return self._argsort(data, self._numeric_column(data, 'price', missing), reverse)
+        
         def get_price_value(item):
-            if not item.price:
-                return float('inf') if reverse else 0.0
-            
-            price_match = re.search(r'(\d+(?:,\d{3})*(?:\.\d{2})?)', item.price)
-            if not price_match:
-                return float('inf') if reverse else 0.0
-            
-            try:
-                return float(price_match.group(1).replace(',', ''))
-            except ValueError:
-                return float('inf') if reverse else 0.0
+            price_value = parse_price_value(item.price) if item.price else None
+            return missing if price_value is None else price_value
         
         return sorted(data, key=get_price_value, reverse=reverse)
     
+    @staticmethod
+    def _numeric_column(data: List[ExtractedData], field: str, missing: float):
+        """Parsed price or rating of every item as a float64 array"""
+        parse = parse_price_value if field == 'price' else parse_rating_value
+        values = (getattr(item, field) for item in data)
+        return np.fromiter(
+            (value if value is not None else missing
+             for value in (parse(raw) if raw else None for raw in values)),
+            dtype=np.float64,
+            count=len(data)
+        )
+    
+    @staticmethod
+    def _argsort(data: List[ExtractedData], keys, reverse: bool) -> List[ExtractedData]:
+        """Order items by key; stable like sorted(), including when reversed"""
+        order = np.argsort(-keys if reverse else keys, kind='stable')
+        return [data[i] for i in order]
+    
     def limit_results(self, data: List[ExtractedData], limit: int) -> List[ExtractedData]:
         """Limit number of results"""
         return data[:limit]
@@ -322,33 +567,29 @@ class ContentExtractor:
         if not key_fields:
             key_fields = ['title', 'url']
         
-        seen = set()
-        unique_data = []
+        # First item per key wins; dicts keep insertion order
+        unique_data = {}
         
         for item in data:
-            # Create key from specified fields
-            key_parts = []
-            for field in key_fields:
-                value = getattr(item, field, '')
-                if value:
-                    key_parts.append(str(value).lower().strip())
-            
-            key = '|'.join(key_parts)
-            
-            if key not in seen:
-                seen.add(key)
-                unique_data.append(item)
+            # Create key from the non-empty key fields
+            key = '|'.join([
+                str(value).casefold().strip()
+                for value in [getattr(item, field, '') for field in key_fields]
+                if value
+            ])
+            unique_data.setdefault(key, item)
         
-        return unique_data
+        return list(unique_data.values())
 
 
 class ExtractorFactory:
     """Factory for creating content extractors"""
     
     @staticmethod
-    def create_extractor() -> ContentExtractor:
-        """Create a content extractor"""
-        return ContentExtractor()
+    @lru_cache(maxsize=2)
+    def create_extractor(capture_raw: bool = False) -> ContentExtractor:
+        """Return the shared content extractor; it holds no per-task state"""
+        return ContentExtractor(capture_raw=capture_raw)
 
 
 # Example usage
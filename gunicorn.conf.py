@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration for the Web Navigator AI Agent
+Usage: gunicorn -c gunicorn.conf.py app:application
+"""
+
+import os
+
+# Bind to the same port the Flask dev server used
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# A single threaded worker: each /run blocks a thread for the length of a
+# browser task, so scale with threads. Session memory, queued task results
+# and the results cache live in the worker process, so with more workers
+# they overwrite each other's memory file and a task still queued in one
+# worker is not found by the others
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+worker_class = "gthread"
+
+# Must outlast TASK_TIMEOUT so long tasks are not killed mid-run
+timeout = 180
+graceful_timeout = 30
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv('LOG_LEVEL', 'info')
@@ -5,13 +5,14 @@ Provides a unified interface for different local LLM backends.
 
 import os
 import json
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -138,19 +139,36 @@ class LLaMAAdapter(BaseLLMAdapter):
         self.model_name = model_name
         self.model = None
         self.tokenizer = None
+        # Retries resend the exact same prompt; keep its device tensors
+        self._tokenize = lru_cache(maxsize=128)(self._tokenize_uncached)
         self._load_model()
     
+    def _tokenize_uncached(self, prompt: str):
+        """Tokenize a prompt onto the model's device (callers must not modify it)"""
+        return self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+    
     def _load_model(self):
         """Load the LLaMA model"""
         try:
             from transformers import AutoTokenizer, AutoModelForCausalLM
             import torch
             
+            load_kwargs = {}
+            if os.getenv('LLM_LOAD_IN_4BIT', 'false').lower() == 'true':
+                # Needs bitsandbytes and a CUDA GPU; generation is memory-bound,
+                # so 4-bit weights cut the bytes read per token
+                from transformers import BitsAndBytesConfig
+                load_kwargs['quantization_config'] = BitsAndBytesConfig(
+                    load_in_4bit=True,
+                    bnb_4bit_compute_dtype=torch.float16
+                )
+            
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
             self.model = AutoModelForCausalLM.from_pretrained(
                 self.model_path,
                 torch_dtype=torch.float16,
-                device_map="auto"
+                device_map="auto",
+                **load_kwargs
             )
             logger.info(f"Loaded LLaMA model from {self.model_path}")
         except Exception as e:
@@ -166,19 +184,22 @@ class LLaMAAdapter(BaseLLMAdapter):
         try:
             import torch
             
-            inputs = self.tokenizer(prompt, return_tensors="pt")
-            with torch.no_grad():
+            # Tokenize straight onto the model's device instead of copying per step
+            inputs = self._tokenize(prompt)
+            with torch.inference_mode():
                 outputs = self.model.generate(
-                    **inputs,
+                    input_ids=inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
                     max_new_tokens=kwargs.get('max_tokens', 512),
                     temperature=kwargs.get('temperature', 0.7),
                     do_sample=True,
+                    use_cache=True,
                     pad_token_id=self.tokenizer.eos_token_id
                 )
             
-            response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            # Remove the input prompt from the response
-            response = response[len(prompt):].strip()
+            # Decode only the generated tokens, not the echoed prompt
+            new_tokens = outputs[0, inputs.input_ids.shape[1]:]
+            response = self.tokenizer.decode(new_tokens, skip_special_tokens=True).strip()
             
             return LLMResponse(
                 content=response,
@@ -224,17 +245,33 @@ class LLMAdapterFactory:
 class LLMManager:
     """Manager for LLM operations with fallback support"""
     
+    # Seconds an availability probe result is trusted before probing again
+    availability_ttl = float(os.getenv('LLM_AVAILABILITY_TTL', 5.0))
+    
     def __init__(self, primary_adapter: BaseLLMAdapter, fallback_adapters: List[BaseLLMAdapter] = None):
         self.primary_adapter = primary_adapter
         self.fallback_adapters = fallback_adapters or []
         self.current_adapter = primary_adapter
+        # id(adapter) -> (probed at, available)
+        self._availability: Dict[int, Tuple[float, bool]] = {}
+    
+    def _check_available(self, adapter: BaseLLMAdapter) -> bool:
+        """adapter.is_available(), reusing a recent probe result"""
+        cached = self._availability.get(id(adapter))
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.availability_ttl:
+            return cached[1]
+        
+        available = adapter.is_available()
+        self._availability[id(adapter)] = (now, available)
+        return available
     
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
         """Generate response with fallback support"""
         adapters_to_try = [self.current_adapter] + self.fallback_adapters
         
         for adapter in adapters_to_try:
-            if not adapter.is_available():
+            if not self._check_available(adapter):
                 logger.warning(f"Adapter {type(adapter).__name__} not available, trying next...")
                 continue
             
@@ -244,13 +281,48 @@ class LLMManager:
                 return response
             except Exception as e:
                 logger.warning(f"Adapter {type(adapter).__name__} failed: {e}")
+                # Probe it again next time rather than trusting the cache
+                self._availability.pop(id(adapter), None)
+                continue
+        
+        raise RuntimeError("All LLM adapters failed")
+    
+    def _probe(self, adapter: BaseLLMAdapter) -> bool:
+        """_check_available() for a worker thread; a failing probe means unavailable"""
+        try:
+            return self._check_available(adapter)
+        except Exception as e:
+            logger.warning(f"Availability check for {type(adapter).__name__} failed: {e}")
+            return False
+    
+    async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
+        """Generate without blocking the event loop, probing every adapter at once"""
+        adapters_to_try = [self.current_adapter] + self.fallback_adapters
+        
+        # Probes such as Ollama's model listing are blocking HTTP calls; start
+        # them all at once, then take the results in priority order so an
+        # available adapter never waits on a slower one behind it
+        probes = [asyncio.ensure_future(asyncio.to_thread(self._probe, adapter)) for adapter in adapters_to_try]
+        
+        for adapter, probe in zip(adapters_to_try, probes):
+            if not await probe:
+                logger.warning(f"Adapter {type(adapter).__name__} not available, trying next...")
+                continue
+            
+            try:
+                response = await asyncio.to_thread(adapter.generate, prompt, **kwargs)
+                self.current_adapter = adapter
+                return response
+            except Exception as e:
+                logger.warning(f"Adapter {type(adapter).__name__} failed: {e}")
+                self._availability.pop(id(adapter), None)
                 continue
         
         raise RuntimeError("All LLM adapters failed")
     
     def is_available(self) -> bool:
         """Check if any adapter is available"""
-        return any(adapter.is_available() for adapter in [self.current_adapter] + self.fallback_adapters)
+        return any(self._check_available(adapter) for adapter in [self.current_adapter] + self.fallback_adapters)
 
 
 # Example usage and configuration
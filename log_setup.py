@@ -0,0 +1,37 @@
+"""
+Logging setup that hands records to a background thread for output
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO, fmt: str = DEFAULT_FORMAT) -> logging.handlers.QueueListener:
+    """Route root logging through a queue so callers only enqueue records"""
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return _listener
+    
+    # Formatting and stream writes happen on the listener thread
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+    log_queue = queue.SimpleQueue()
+    
+    # Replace handlers installed by earlier basicConfig() calls in imported modules
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
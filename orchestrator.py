@@ -4,8 +4,13 @@ Orchestrator for coordinating the AI agent's execution flow
 
 import asyncio
 import logging
+import os
+import random
 import time
 import uuid
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -13,8 +18,9 @@ from datetime import datetime
 from .llm_adapter import LLMManager, create_default_llm_manager
 from .parser import InstructionParser, InstructionParserFactory
 from .planner import StepPlanner, StepPlannerFactory, Step
-from .browser_controller import BrowserController, BrowserControllerFactory, BrowserConfig
-from .extractor import ContentExtractor, ExtractorFactory
+from .browser_controller import BrowserController, BrowserControllerFactory, BrowserConfig, rows_from_columns
+from .browser_pool import BrowserPool
+from .extractor import ContentExtractor, ExtractorFactory, parse_price_value, parse_rating_value
 from ..utils.storage import DataStorage, StorageFactory, TaskResult, ExportConfig
 from ..memory.session_memory import SessionMemory, MemoryFactory
 
@@ -22,6 +28,42 @@ from ..memory.session_memory import SessionMemory, MemoryFactory
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-task execution state; every execute() runs in its own asyncio task,
+# so concurrent tasks on one orchestrator keep separate logs
+_current_task_id: ContextVar[Optional[str]] = ContextVar('current_task_id', default=None)
+_execution_logs: ContextVar[Optional[deque]] = ContextVar('execution_logs', default=None)
+
+# Per-task log entries kept in memory; the oldest are dropped beyond this
+MAX_EXECUTION_LOGS = 2048
+
+# Step retries back off exponentially from RETRY_BASE_DELAY seconds, capped
+# at RETRY_MAX_DELAY, with jitter so concurrent steps don't retry in lockstep
+RETRY_BASE_DELAY = float(os.getenv('STEP_RETRY_BASE_DELAY', 0.1))
+RETRY_MAX_DELAY = float(os.getenv('STEP_RETRY_MAX_DELAY', 2.0))
+_rng = random.Random()
+
+# Most finished-task memory records written per disk save
+MEMORY_FLUSH_BATCH = 32
+
+_LOG_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING, "info": logging.INFO}
+
+
+def _iso(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO-8601 timestamp"""
+    seconds, ns = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat()
+
+
+# Browser call for each planned step action
+_STEP_ACTIONS = {
+    "goto": lambda browser, step: browser.goto(step.url, step.timeout),
+    "click": lambda browser, step: browser.safe_click(step.selector, step.timeout),
+    "fill": lambda browser, step: browser.fill(step.selector, step.value, step.timeout),
+    "extract": lambda browser, step: browser.safe_extract(step.selector, step.multiple, step.timeout, columnar=step.multiple),
+    "wait": lambda browser, step: browser.wait(step.timeout),
+    "screenshot": lambda browser, step: browser.screenshot(),
+}
+
 
 @dataclass
 class ExecutionResult:
@@ -63,15 +105,119 @@ class Orchestrator:
         self.storage = StorageFactory.create_storage(self.storage_config)
         self.memory = memory or MemoryFactory.create_memory()
         
-        # Execution state
-        self.current_task_id: Optional[str] = None
-        self.execution_logs: List[Dict[str, Any]] = []
+        # Dashboard queries, keyed on the backing file's mtime so saves from
+        # any process invalidate them; history also keys on the results still
+        # queued for writing, stats on the in-memory session counters
+        self._task_history = lru_cache(maxsize=1)(lambda _version: self.storage.list_task_results())
+        self._session_stats = lru_cache(maxsize=1)(lambda _version: self.memory.get_session_stats())
+        
+        # Memory records of finished tasks, saved by a background task
+        self._memory_queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    # Execution state is read from the module's ContextVars, so it belongs to
+    # the running task (execute() sets it) rather than to this instance
+    @property
+    def current_task_id(self) -> Optional[str]:
+        return _current_task_id.get()
+    
+    @current_task_id.setter
+    def current_task_id(self, task_id: Optional[str]):
+        _current_task_id.set(task_id)
+    
+    @property
+    def execution_logs(self) -> deque:
+        logs = _execution_logs.get()
+        if logs is None:
+            logs = deque(maxlen=MAX_EXECUTION_LOGS)
+            _execution_logs.set(logs)
+        return logs
+    
+    @execution_logs.setter
+    def execution_logs(self, logs: deque):
+        _execution_logs.set(logs)
+    
+    async def __aenter__(self):
+        """Launch a browser up front so the first task doesn't pay for startup"""
+        await self._ensure_browser()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def _ensure_browser(self):
+        """Put a warm browser for this orchestrator's config in the pool"""
+        try:
+            await BrowserPool.release(await BrowserPool.acquire(self.browser_config))
+        except Exception as e:
+            logger.warning(f"Could not pre-launch browser: {e}")
+    
+    async def aclose(self):
+        """Write out queued memories and task results"""
+        # Browsers stay in the process-wide pool, which other orchestrators may
+        # be using; entry points call BrowserPool.shutdown() when they exit
+        await self.drain()
+        await asyncio.to_thread(self.storage.flush)
+    
+    def _queue_memory(self, **record):
+        """Hand a memory record (add_memory keywords) to the background writer"""
+        loop = asyncio.get_running_loop()
+        if self._flush_task is None or self._flush_task.done() or self._flush_task.get_loop() is not loop:
+            self._memory_queue = asyncio.Queue()
+            self._flush_task = loop.create_task(self._flush_memories(self._memory_queue))
+        self._memory_queue.put_nowait(record)
+    
+    def _write_memories(self, records: List[Dict[str, Any]]):
+        """Add a batch of memory records with a single disk save"""
+        self.memory.add_memories(records)
+    
+    async def _flush_memories(self, queue: asyncio.Queue):
+        """Save queued memory records, batching whatever piled up during the last save"""
+        loop = asyncio.get_running_loop()
+        pending: List[Dict[str, Any]] = []
+        inflight: Optional[asyncio.Future] = None
+        try:
+            while True:
+                pending.append(await queue.get())
+                while len(pending) < MEMORY_FLUSH_BATCH and not queue.empty():
+                    pending.append(queue.get_nowait())
+                
+                batch, pending = pending, []
+                # Shielded, so cancelling this task never abandons a save mid-write
+                inflight = loop.run_in_executor(None, self._write_memories, batch)
+                try:
+                    await asyncio.shield(inflight)
+                except Exception as e:
+                    logger.error(f"Failed to save {len(batch)} memories: {e}")
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+        except asyncio.CancelledError:
+            # The event loop is closing; let the running save finish, then
+            # save what is left before it goes
+            if inflight is not None and not inflight.done():
+                try:
+                    await inflight
+                except Exception as e:
+                    logger.error(f"Failed to save memories: {e}")
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            if pending:
+                self._write_memories(pending)
+            raise
+    
+    async def drain(self):
+        """Wait until every queued memory record has been saved"""
+        task = self._flush_task
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            await self._memory_queue.join()
     
     async def execute(self, instruction: str, task_id: Optional[str] = None) -> ExecutionResult:
         """Execute a natural language instruction"""
         start_time = time.time()
         task_id = task_id or str(uuid.uuid4())
         self.current_task_id = task_id
+        self.execution_logs = deque(maxlen=MAX_EXECUTION_LOGS)
         
         try:
             self._log("info", f"Starting execution of task {task_id}", {"instruction": instruction})
@@ -80,8 +226,9 @@ class Orchestrator:
             context = self.memory.get_context_for_instruction(instruction)
             self._log("info", "Retrieved context from memory", {"context_keys": list(context.keys())})
             
-            # Parse instruction
-            parsed_instruction = self.parser.parse(instruction)
+            # Parse instruction; the LLM call blocks, so keep it off the event
+            # loop and let concurrent tasks keep driving their browsers
+            parsed_instruction = await self.parser.parse_async(instruction)
             self._log("info", "Parsed instruction", {
                 "task": parsed_instruction.task,
                 "query": parsed_instruction.query,
@@ -108,7 +255,7 @@ class Orchestrator:
                 instruction=instruction,
                 results=processed_results,
                 execution_time=execution_time,
-                logs=self.execution_logs.copy(),
+                logs=self._snapshot_logs(),
                 metadata={
                     "parsed_instruction": {
                         "task": parsed_instruction.task,
@@ -123,7 +270,7 @@ class Orchestrator:
             )
             
             # Save to memory
-            self.memory.add_memory(
+            self._queue_memory(
                 instruction=instruction,
                 result=processed_results,
                 success=execution_result.status == "success",
@@ -138,10 +285,9 @@ class Orchestrator:
                 instruction=instruction,
                 results=processed_results,
                 metadata=execution_result.metadata,
-                timestamp=datetime.now(),
                 execution_time=execution_time
             )
-            self.storage.save_task_result(task_result)
+            self.storage.queue_task_result(task_result)
             
             self._log("info", f"Completed task {task_id}", {
                 "status": execution_result.status,
@@ -158,7 +304,7 @@ class Orchestrator:
             self._log("error", f"Task {task_id} failed", {"error": error_msg})
             
             # Save error to memory
-            self.memory.add_memory(
+            self._queue_memory(
                 instruction=instruction,
                 result={"error": error_msg},
                 success=False,
@@ -173,7 +319,7 @@ class Orchestrator:
                 results=[],
                 execution_time=execution_time,
                 error_message=error_msg,
-                logs=self.execution_logs.copy()
+                logs=self._snapshot_logs()
             )
         
         finally:
@@ -185,66 +331,82 @@ class Orchestrator:
         results = []
         
         async with BrowserController(self.browser_config) as browser:
-            for i, step in enumerate(steps):
-                try:
+            for stage in self._group_steps(steps):
+                for i, step in stage:
                     self._log("info", f"Executing step {i+1}/{len(steps)}", {
                         "action": step.action,
                         "selector": step.selector,
                         "value": step.value,
                         "url": step.url
                     })
+                
+                # Steps in a stage only read the page, so they run concurrently;
+                # gather keeps their results in plan order
+                step_results = await asyncio.gather(
+                    *(self._execute_step_with_retry(browser, step) for _, step in stage),
+                    return_exceptions=True
+                )
+                
+                stop = False
+                for (i, step), step_result in zip(stage, step_results):
+                    if isinstance(step_result, Exception):
+                        self._log("error", f"Step {i+1} execution error", {"error": str(step_result)})
+                        continue
                     
-                    # Execute step with retry logic
-                    step_result = await self._execute_step_with_retry(browser, step)
-                    
-                    if step_result.success:
-                        self._log("info", f"Step {i+1} completed successfully")
+                    try:
+                        if step_result.success:
+                            self._log("info", f"Step {i+1} completed successfully")
+                            
+                            # Extract data if this is an extract step
+                            if step.action == "extract" and step_result.data:
+                                extracted_data = self._extract_data_from_step_result(step_result, parsed_instruction)
+                                if extracted_data:
+                                    results.extend(extracted_data)
+                        else:
+                            self._log("warning", f"Step {i+1} failed", {"error": step_result.error})
+                            
+                            # Continue with next step unless it's a critical step
+                            if step.action in ["goto", "click"]:
+                                self._log("error", f"Critical step {i+1} failed, stopping execution")
+                                stop = True
+                                break
                         
-                        # Extract data if this is an extract step
-                        if step.action == "extract" and step_result.data:
-                            extracted_data = self._extract_data_from_step_result(step_result, parsed_instruction)
-                            if extracted_data:
-                                results.extend(extracted_data)
-                    else:
-                        self._log("warning", f"Step {i+1} failed", {"error": step_result.error})
-                        
-                        # Continue with next step unless it's a critical step
-                        if step.action in ["goto", "click"]:
-                            self._log("error", f"Critical step {i+1} failed, stopping execution")
-                            break
-                    
-                except Exception as e:
-                    self._log("error", f"Step {i+1} execution error", {"error": str(e)})
-                    continue
+                    except Exception as e:
+                        self._log("error", f"Step {i+1} execution error", {"error": str(e)})
+                        continue
+                
+                if stop:
+                    break
         
         return results
     
+    @staticmethod
+    def _group_steps(steps: List[Step]) -> List[List[Tuple[int, Step]]]:
+        """Split steps into stages: each run of parallel-safe steps, or one other step"""
+        stages: List[List[Tuple[int, Step]]] = []
+        for i, step in enumerate(steps):
+            if step.parallel_safe and stages and stages[-1][-1][1].parallel_safe:
+                stages[-1].append((i, step))
+            else:
+                stages.append([(i, step)])
+        return stages
+    
     async def _execute_step_with_retry(self, browser: BrowserController, step: Step) -> Any:
         """Execute a single step with retry logic"""
         last_error = None
+        action = _STEP_ACTIONS.get(step.action)
         
         for attempt in range(step.retries):
             try:
-                if step.action == "goto":
-                    return await browser.goto(step.url, step.timeout)
-                elif step.action == "click":
-                    return await browser.safe_click(step.selector, step.timeout)
-                elif step.action == "fill":
-                    return await browser.fill(step.selector, step.value, step.timeout)
-                elif step.action == "extract":
-                    return await browser.safe_extract(step.selector, step.multiple, step.timeout)
-                elif step.action == "wait":
-                    return await browser.wait(step.timeout)
-                elif step.action == "screenshot":
-                    return await browser.screenshot()
-                else:
+                if action is None:
                     raise ValueError(f"Unknown action: {step.action}")
+                return await action(browser, step)
                     
             except Exception as e:
                 last_error = e
                 if attempt < step.retries - 1:
                     self._log("warning", f"Step failed, retrying ({attempt+1}/{step.retries})", {"error": str(e)})
-                    await asyncio.sleep(1)  # Wait before retry
+                    await asyncio.sleep(self._retry_delay(attempt))
                 else:
                     self._log("error", f"Step failed after {step.retries} attempts", {"error": str(e)})
         
@@ -256,6 +418,11 @@ class Orchestrator:
             metadata={"action": step.action, "attempts": step.retries}
         )
     
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Seconds to wait before retry number `attempt + 1`"""
+        return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)) * _rng.uniform(0.5, 1.0)
+    
     def _extract_data_from_step_result(self, step_result, parsed_instruction) -> List[Dict[str, Any]]:
         """Extract structured data from step result"""
         try:
@@ -263,7 +430,13 @@ class Orchestrator:
                 return []
             
             # Use extractor to process the data
-            if isinstance(step_result.data, list):
+            if step_result.metadata.get('columnar'):
+                # Columnar extract; rows are rebuilt one at a time as the extractor reads them
+                extracted_data = self.extractor.extract_from_playwright_data(
+                    rows_from_columns(step_result.data),
+                    parsed_instruction.selectors
+                )
+            elif isinstance(step_result.data, list):
                 # Multiple elements extracted
                 extracted_data = self.extractor.extract_from_playwright_data(
                     step_result.data,
@@ -278,20 +451,15 @@ class Orchestrator:
             
             # Convert to dictionary format
             results = []
+            max_price = parsed_instruction.filters.get('price_max')
             for data in extracted_data:
                 result_dict = data.to_dict()
                 
                 # Filter by price if specified
-                if parsed_instruction.filters.get('price_max'):
-                    max_price = parsed_instruction.filters['price_max']
-                    if result_dict.get('price'):
-                        # Extract numeric price for comparison
-                        import re
-                        price_match = re.search(r'(\d+(?:,\d{3})*(?:\.\d{2})?)', result_dict['price'])
-                        if price_match:
-                            price_value = float(price_match.group(1).replace(',', ''))
-                            if price_value > max_price:
-                                continue
+                if max_price and result_dict.get('price'):
+                    price_value = parse_price_value(result_dict['price'])
+                    if price_value is not None and price_value > max_price:
+                        continue
                 
                 results.append(result_dict)
             
@@ -317,30 +485,46 @@ class Orchestrator:
             if not results:
                 return []
             
-            # Remove duplicates
-            results = self.extractor.deduplicate(results)
+            filters = parsed_instruction.filters or {}
+            max_price = filters.get('price_max')
+            min_price = filters.get('price_min')
+            sort = filters.get('sort')
             
-            # Apply filters
-            if parsed_instruction.filters:
-                if 'price_max' in parsed_instruction.filters:
-                    max_price = parsed_instruction.filters['price_max']
-                    results = self.extractor.filter_by_price(results, max_price=max_price)
+            # One pass: drop duplicates (by title and URL) and rows outside the
+            # price range, parsing each row's price and rating only once
+            unique = {}
+            for result in results:
+                key = '|'.join([
+                    str(value).casefold().strip()
+                    for value in (result.get('title'), result.get('url'))
+                    if value
+                ])
+                if key in unique:
+                    continue
+                
+                price = parse_price_value(result['price']) if result.get('price') else None
+                if max_price or min_price:
+                    if price is None:
+                        continue
+                    if max_price and price > max_price:
+                        continue
+                    if min_price and price < min_price:
+                        continue
                 
-                if 'price_min' in parsed_instruction.filters:
-                    min_price = parsed_instruction.filters['price_min']
-                    results = self.extractor.filter_by_price(results, min_price=min_price)
+                rating = parse_rating_value(result['rating']) if result.get('rating') else None
+                unique[key] = (result, price, rating)
+            
+            rows = list(unique.values())
             
             # Sort results
-            if parsed_instruction.filters.get('sort') == 'rating':
-                results = self.extractor.sort_by_rating(results)
-            elif parsed_instruction.filters.get('sort') == 'price':
-                results = self.extractor.sort_by_price(results)
+            if sort == 'rating':
+                rows.sort(key=lambda row: 0.0 if row[2] is None else row[2], reverse=True)
+            elif sort == 'price':
+                rows.sort(key=lambda row: 0.0 if row[1] is None else row[1])
             
             # Limit results
             limit = parsed_instruction.count or 5
-            results = self.extractor.limit_results(results, limit)
-            
-            return results
+            return [row[0] for row in rows[:limit]]
             
         except Exception as e:
             self._log("error", "Failed to process results", {"error": str(e)})
@@ -349,7 +533,7 @@ class Orchestrator:
     def _log(self, level: str, message: str, data: Dict[str, Any] = None):
         """Log execution information"""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp_ns": time.time_ns(),
             "level": level,
             "message": message,
             "task_id": self.current_task_id,
@@ -358,20 +542,34 @@ class Orchestrator:
         
         self.execution_logs.append(log_entry)
         
-        if level == "error":
-            logger.error(f"[{self.current_task_id}] {message}", extra=data)
-        elif level == "warning":
-            logger.warning(f"[{self.current_task_id}] {message}", extra=data)
-        else:
-            logger.info(f"[{self.current_task_id}] {message}", extra=data)
+        log_level = _LOG_LEVELS.get(level, logging.INFO)
+        if logger.isEnabledFor(log_level):
+            logger.log(log_level, f"[{log_entry['task_id']}] {message}", extra=data)
+    
+    def _snapshot_logs(self) -> List[Dict[str, Any]]:
+        """Copy the current task's logs, formatting timestamps for output"""
+        return [
+            {"timestamp": _iso(entry["timestamp_ns"]), **{k: v for k, v in entry.items() if k != "timestamp_ns"}}
+            for entry in self.execution_logs
+        ]
     
     def get_task_history(self) -> List[Dict[str, Any]]:
         """Get task execution history"""
-        return self.storage.list_task_results()
+        try:
+            mtime = (self.storage.output_dir / "json").stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        return self._task_history((mtime, self.storage.pending_ids()))
     
     def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics"""
-        return self.memory.get_session_stats()
+        try:
+            mtime = self.memory.memory_file.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        ctx = self.memory.session_context
+        counters = ctx and (ctx.session_id, ctx.total_tasks, ctx.successful_tasks, ctx.failed_tasks, ctx.last_activity)
+        return self._session_stats((mtime, counters))
     
     def clear_memory(self):
         """Clear session memory"""
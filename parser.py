@@ -2,17 +2,32 @@
 Instruction Parser for converting natural language to structured plans
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, asdict
 from .llm_adapter import LLMManager, create_default_llm_manager
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib decoder
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# JSON object in an LLM response, bare or inside a ``` code block
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_CODE_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.DOTALL)
+
 
 @dataclass
 class ParsedInstruction:
@@ -28,19 +43,130 @@ class ParsedInstruction:
     raw_instruction: str
 
 
+PROMPT_TEMPLATE_PATH = 'src/prompts/instruction_parser.txt'
+
+
+@lru_cache(maxsize=4)
+def _read_prompt_template(path: str) -> Optional[str]:
+    """Read a prompt template once per process; None if the file is missing"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _template_digest(template: str) -> str:
+    """Hash of a prompt template, so cached plans are tied to the prompt that made them"""
+    return hashlib.blake2b(template.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Keyword table for the fallback parser, checked in priority order
+FALLBACK_TASK_KEYWORDS = (
+    ('search', ('search',)),
+    ('navigate', ('navigate', 'go to')),
+    ('extract', ('extract', 'get')),
+    ('fill_form', ('fill', 'form')),
+)
+
+
+@lru_cache(maxsize=256)
+def _classify_fallback_task(instruction_lower: str) -> str:
+    """Task of the first keyword group found in the instruction; search by default"""
+    for task, keywords in FALLBACK_TASK_KEYWORDS:
+        if any(keyword in instruction_lower for keyword in keywords):
+            return task
+    return 'search'
+
+
+class ParseCache:
+    """Parsed instructions kept in memory and, if given a path, in SQLite across runs"""
+    
+    def __init__(self, db_path: Optional[str] = None, maxsize: int = 1024):
+        self.db_path = db_path
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(template_digest: str, instruction: str) -> str:
+        """Key an instruction by prompt template and normalized wording"""
+        normalized = ' '.join(instruction.split()).lower()
+        return hashlib.blake2b(f"{template_digest}\n{normalized}".encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS parse_cache (key TEXT PRIMARY KEY, json TEXT, ts REAL)")
+        return conn
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached plan, if any"""
+        with self._lock:
+            raw = self._entries.get(key)
+            if raw is not None:
+                self._entries.move_to_end(key)
+        
+        if raw is None and self.db_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT json FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read parse cache {self.db_path}: {e}")
+                row = None
+            if row is not None:
+                raw = row[0]
+                self._remember(key, raw)
+        
+        if raw is None:
+            return None
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    
+    def put(self, key: str, plan: Dict[str, Any]):
+        """Store a parsed plan"""
+        if orjson is not None:
+            raw = orjson.dumps(plan).decode('utf-8')
+        else:
+            raw = json.dumps(plan, ensure_ascii=False)
+        self._remember(key, raw)
+        
+        if self.db_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, strftime('%s', 'now'))",
+                        (key, raw)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write parse cache {self.db_path}: {e}")
+    
+    def _remember(self, key: str, raw: str):
+        with self._lock:
+            self._entries[key] = raw
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
 class InstructionParser:
     """Parser for converting natural language instructions to structured plans"""
     
     def __init__(self, llm_manager: Optional[LLMManager] = None):
         self.llm_manager = llm_manager or create_default_llm_manager()
         self._load_prompt_template()
+        self._template_digest = _template_digest(self.prompt_template)
+        # Repeated instructions skip the LLM; set PARSE_CACHE_PATH to keep
+        # parsed plans across runs as well
+        self.cache = ParseCache(os.getenv('PARSE_CACHE_PATH') or None)
     
     def _load_prompt_template(self):
         """Load the prompt template for instruction parsing"""
-        try:
-            with open('src/prompts/instruction_parser.txt', 'r', encoding='utf-8') as f:
-                self.prompt_template = f.read()
-        except FileNotFoundError:
+        template = _read_prompt_template(PROMPT_TEMPLATE_PATH)
+        if template is not None:
+            self.prompt_template = template
+        else:
             # Fallback template if file not found
             self.prompt_template = self._get_fallback_template()
             logger.warning("Using fallback prompt template")
@@ -73,47 +199,85 @@ Return only valid JSON, no additional text.
     def parse(self, instruction: str) -> ParsedInstruction:
         """Parse a natural language instruction into a structured plan"""
         try:
-            # Use LLM to parse the instruction
-            full_prompt = f"{self.prompt_template}\n\nInstruction: {instruction}"
-            response = self.llm_manager.generate(full_prompt)
-            
-            # Extract JSON from response
-            json_str = self._extract_json(response.content)
-            plan_data = json.loads(json_str)
+            cache_key, cached = self._from_cache(instruction)
+            if cached is not None:
+                return cached
             
-            # Create structured instruction
-            parsed = ParsedInstruction(
-                task=plan_data.get('task', 'search'),
-                query=plan_data.get('query', instruction),
-                filters=plan_data.get('filters', {}),
-                count=plan_data.get('count', 5),
-                fields=plan_data.get('fields', ['title', 'url']),
-                target_url=plan_data.get('target_url'),
-                selectors=plan_data.get('selectors', {}),
-                actions=plan_data.get('actions', []),
-                raw_instruction=instruction
-            )
+            # Use LLM to parse the instruction
+            response = self.llm_manager.generate(self._build_prompt(instruction))
+            return self._from_response(instruction, response.content, cache_key)
             
-            # Validate and enhance the parsed instruction
-            parsed = self._validate_and_enhance(parsed)
+        except Exception as e:
+            logger.error(f"Failed to parse instruction: {e}")
+            # Return a fallback parsed instruction
+            return self._create_fallback_instruction(instruction)
+    
+    async def parse_async(self, instruction: str) -> ParsedInstruction:
+        """parse(), awaiting the LLM without blocking the event loop"""
+        try:
+            cache_key, cached = self._from_cache(instruction)
+            if cached is not None:
+                return cached
             
-            logger.info(f"Parsed instruction: {parsed.task} - {parsed.query}")
-            return parsed
+            response = await self.llm_manager.generate_async(self._build_prompt(instruction))
+            return self._from_response(instruction, response.content, cache_key)
             
         except Exception as e:
             logger.error(f"Failed to parse instruction: {e}")
-            # Return a fallback parsed instruction
             return self._create_fallback_instruction(instruction)
     
+    def _build_prompt(self, instruction: str) -> str:
+        """Prompt asking the LLM to plan an instruction"""
+        return f"{self.prompt_template}\n\nInstruction: {instruction}"
+    
+    def _from_cache(self, instruction: str) -> Tuple[str, Optional[ParsedInstruction]]:
+        """Return (cache key, cached plan or None) for an instruction"""
+        cache_key = ParseCache.key(self._template_digest, instruction)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        
+        cached['raw_instruction'] = instruction
+        logger.info(f"Parsed instruction from cache: {cached['task']} - {cached['query']}")
+        return cache_key, ParsedInstruction(**cached)
+    
+    def _from_response(self, instruction: str, content: str, cache_key: str) -> ParsedInstruction:
+        """Build, validate and cache a plan from the LLM's reply"""
+        # Extract JSON from response
+        json_str = self._extract_json(content)
+        plan_data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+        
+        # Create structured instruction
+        parsed = ParsedInstruction(
+            task=plan_data.get('task', 'search'),
+            query=plan_data.get('query', instruction),
+            filters=plan_data.get('filters', {}),
+            count=plan_data.get('count', 5),
+            fields=plan_data.get('fields', ['title', 'url']),
+            target_url=plan_data.get('target_url'),
+            selectors=plan_data.get('selectors', {}),
+            actions=plan_data.get('actions', []),
+            raw_instruction=instruction
+        )
+        
+        # Validate and enhance the parsed instruction
+        parsed = self._validate_and_enhance(parsed)
+        
+        # Fallback plans are not cached, so a later call retries the LLM
+        self.cache.put(cache_key, asdict(parsed))
+        
+        logger.info(f"Parsed instruction: {parsed.task} - {parsed.query}")
+        return parsed
+    
     def _extract_json(self, text: str) -> str:
         """Extract JSON from LLM response"""
         # Try to find JSON in the response
-        json_match = re.search(r'\{.*\}', text, re.DOTALL)
+        json_match = _JSON_OBJECT_RE.search(text)
         if json_match:
             return json_match.group(0)
         
         # If no JSON found, try to extract from code blocks
-        code_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', text, re.DOTALL)
+        code_match = _JSON_CODE_BLOCK_RE.search(text)
         if code_match:
             return code_match.group(1)
         
@@ -210,23 +374,8 @@ Return only valid JSON, no additional text.
         logger.warning(f"Using fallback parser for instruction: {instruction}")
         
         # Simple keyword-based parsing
-        instruction_lower = instruction.lower()
-        
-        if 'search' in instruction_lower:
-            task = 'search'
-            query = instruction
-        elif 'navigate' in instruction_lower or 'go to' in instruction_lower:
-            task = 'navigate'
-            query = instruction
-        elif 'extract' in instruction_lower or 'get' in instruction_lower:
-            task = 'extract'
-            query = instruction
-        elif 'fill' in instruction_lower or 'form' in instruction_lower:
-            task = 'fill_form'
-            query = instruction
-        else:
-            task = 'search'
-            query = instruction
+        task = _classify_fallback_task(instruction.lower())
+        query = instruction
         
         return ParsedInstruction(
             task=task,
@@ -27,6 +27,11 @@ class Step:
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
+    
+    @property
+    def parallel_safe(self) -> bool:
+        """Read-only steps that can run alongside their neighbours on the same page"""
+        return self.action == "extract"
 
 
 class StepPlanner:
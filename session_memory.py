@@ -5,17 +5,33 @@ Session memory system for maintaining context and task history
 import json
 import os
 import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import uuid
 
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _read_memory_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a memory file once per version; callers must not mutate the result"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 @dataclass
 class MemoryEntry:
     """Single memory entry"""
@@ -49,11 +65,12 @@ class MemoryEntry:
         return cls(
             id=data['id'],
             instruction=data['instruction'],
-            result=data['result'],
+            # Copied so edits to an entry don't reach the cached file parse
+            result=dict(data['result']),
             timestamp=datetime.fromisoformat(data['timestamp']),
             task_type=data['task_type'],
             success=data['success'],
-            metadata=data.get('metadata', {})
+            metadata=dict(data.get('metadata', {}))
         )
 
 
@@ -97,6 +114,11 @@ class SessionMemory:
         self.session_context: Optional[SessionContext] = None
         self.max_memories = 100  # Maximum number of memories to keep
         self.memory_ttl_days = 7  # Memory time-to-live in days
+        self._defer_depth = 0
+        self._dirty = False
+        # Guards memories, the session context and the deferred-save counters;
+        # the orchestrator saves memories from a worker thread
+        self._lock = threading.RLock()
         
         if self.persist_to_disk:
             self._load_from_disk()
@@ -121,8 +143,7 @@ class SessionMemory:
         """Load memory from disk"""
         try:
             if self.memory_file.exists():
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _read_memory_file(str(self.memory_file), self.memory_file.stat().st_mtime_ns)
                 
                 # Load memories
                 self.memories = [
@@ -141,7 +162,7 @@ class SessionMemory:
                         successful_tasks=ctx_data['successful_tasks'],
                         failed_tasks=ctx_data['failed_tasks'],
                         current_task=ctx_data.get('current_task'),
-                        preferences=ctx_data.get('preferences', {})
+                        preferences=dict(ctx_data.get('preferences') or {})
                     )
                 
                 logger.info(f"Loaded {len(self.memories)} memories from disk")
@@ -153,61 +174,88 @@ class SessionMemory:
     
     def _save_to_disk(self):
         """Save memory to disk"""
-        if not self.persist_to_disk:
-            return
-        
-        try:
-            data = {
-                'memories': [mem.to_dict() for mem in self.memories],
-                'session_context': self.session_context.to_dict() if self.session_context else None
-            }
-            
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            logger.debug("Saved memory to disk")
+        with self._lock:
+            if not self.persist_to_disk:
+                return
+            if self._defer_depth:
+                self._dirty = True
+                return
             
-        except Exception as e:
-            logger.error(f"Failed to save memory to disk: {e}")
+            try:
+                data = {
+                    'memories': [mem.to_dict() for mem in self.memories],
+                    'session_context': self.session_context.to_dict() if self.session_context else None
+                }
+                
+                if orjson is not None:
+                    with open(self.memory_file, 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                else:
+                    with open(self.memory_file, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                self._dirty = False
+                
+                logger.debug("Saved memory to disk")
+                
+            except Exception as e:
+                logger.error(f"Failed to save memory to disk: {e}")
+    
+    @contextmanager
+    def deferred_saves(self):
+        """Hold disk writes until the block exits, then save once if anything changed"""
+        with self._lock:
+            self._defer_depth += 1
+            try:
+                yield self
+            finally:
+                self._defer_depth -= 1
+                if not self._defer_depth and self._dirty:
+                    self._save_to_disk()
     
     def add_memory(self, instruction: str, result: Dict[str, Any], success: bool = True, task_type: str = "unknown", metadata: Dict[str, Any] = None) -> str:
         """Add a new memory entry"""
-        try:
-            memory_id = str(uuid.uuid4())
-            
-            entry = MemoryEntry(
-                id=memory_id,
-                instruction=instruction,
-                result=result,
-                timestamp=datetime.now(),
-                task_type=task_type,
-                success=success,
-                metadata=metadata or {}
-            )
-            
-            self.memories.append(entry)
-            
-            # Update session context
-            if self.session_context:
-                self.session_context.total_tasks += 1
-                if success:
-                    self.session_context.successful_tasks += 1
-                else:
-                    self.session_context.failed_tasks += 1
-                self.session_context.last_activity = datetime.now()
-            
-            # Cleanup old memories
-            self._cleanup_old_memories()
-            
-            # Save to disk
-            self._save_to_disk()
-            
-            logger.info(f"Added memory: {memory_id}")
-            return memory_id
-            
-        except Exception as e:
-            logger.error(f"Failed to add memory: {e}")
-            return ""
+        with self._lock:
+            try:
+                memory_id = str(uuid.uuid4())
+                
+                entry = MemoryEntry(
+                    id=memory_id,
+                    instruction=instruction,
+                    result=result,
+                    timestamp=datetime.now(),
+                    task_type=task_type,
+                    success=success,
+                    metadata=metadata or {}
+                )
+                
+                self.memories.append(entry)
+                
+                # Update session context
+                if self.session_context:
+                    self.session_context.total_tasks += 1
+                    if success:
+                        self.session_context.successful_tasks += 1
+                    else:
+                        self.session_context.failed_tasks += 1
+                    self.session_context.last_activity = datetime.now()
+                
+                # Cleanup old memories
+                self._cleanup_old_memories()
+                
+                # Save to disk
+                self._save_to_disk()
+                
+                logger.info(f"Added memory: {memory_id}")
+                return memory_id
+                
+            except Exception as e:
+                logger.error(f"Failed to add memory: {e}")
+                return ""
+    
+    def add_memories(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """Add several memories (add_memory keyword dicts) with a single disk write"""
+        with self.deferred_saves():
+            return [self.add_memory(**entry) for entry in entries]
     
     def get_recent_memories(self, limit: int = 10) -> List[MemoryEntry]:
         """Get recent memory entries"""
@@ -278,9 +326,10 @@ class SessionMemory:
     
     def update_preferences(self, preferences: Dict[str, Any]):
         """Update user preferences"""
-        if self.session_context:
-            self.session_context.preferences.update(preferences)
-            self._save_to_disk()
+        with self._lock:
+            if self.session_context:
+                self.session_context.preferences.update(preferences)
+                self._save_to_disk()
     
     def _cleanup_old_memories(self):
         """Remove old memories to prevent memory bloat"""
@@ -301,13 +350,14 @@ class SessionMemory:
     
     def clear_memories(self):
         """Clear all memories"""
-        self.memories = []
-        if self.session_context:
-            self.session_context.total_tasks = 0
-            self.session_context.successful_tasks = 0
-            self.session_context.failed_tasks = 0
-        self._save_to_disk()
-        logger.info("Cleared all memories")
+        with self._lock:
+            self.memories = []
+            if self.session_context:
+                self.session_context.total_tasks = 0
+                self.session_context.successful_tasks = 0
+                self.session_context.failed_tasks = 0
+            self._save_to_disk()
+            logger.info("Cleared all memories")
     
     def export_memories(self, filename: Optional[str] = None) -> str:
         """Export memories to a file"""
@@ -323,8 +373,12 @@ class SessionMemory:
             }
             
             filepath = Path(filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(export_data, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Exported {len(self.memories)} memories to {filepath}")
             return str(filepath)
@@ -345,16 +399,17 @@ class SessionMemory:
                 data = json.load(f)
             
             imported_count = 0
-            for mem_data in data.get('memories', []):
-                try:
-                    entry = MemoryEntry.from_dict(mem_data)
-                    self.memories.append(entry)
-                    imported_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to import memory entry: {e}")
-                    continue
-            
-            self._save_to_disk()
+            with self._lock:
+                for mem_data in data.get('memories', []):
+                    try:
+                        entry = MemoryEntry.from_dict(mem_data)
+                        self.memories.append(entry)
+                        imported_count += 1
+                    except Exception as e:
+                        logger.warning(f"Failed to import memory entry: {e}")
+                        continue
+                
+                self._save_to_disk()
             logger.info(f"Imported {imported_count} memories from {filename}")
             return True
             
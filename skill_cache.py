@@ -0,0 +1,154 @@
+"""
+Skill cache that remembers which sites serve their content as static HTML,
+so later visits can fetch the page over plain HTTP instead of navigating
+"""
+
+import os
+import re
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Opening <head> tag, where a <base> is injected so relative links resolve
+# against the real URL
+_HEAD_RE = re.compile(r"<head(\s[^>]*)?>", re.IGNORECASE)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+@dataclass
+class Skill:
+    """What was learned about navigating one kind of page on a domain"""
+    domain: str
+    signature: str
+    static: bool
+    hits: int = 0
+
+
+class SkillCache:
+    """SQLite-backed store of per-domain navigation skills"""
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.getenv('SKILL_CACHE_PATH', 'skill_cache.db')
+        self._skills: Dict[Tuple[str, str], Skill] = {}
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def key(url: str, task_hint: str = "") -> Tuple[str, str]:
+        """Key a URL by domain and (path with query, task hint)"""
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        return parsed.netloc.lower(), f"{path}|{task_hint}"
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS skills ("
+            "domain TEXT, signature TEXT, static INTEGER, hits INTEGER, "
+            "PRIMARY KEY (domain, signature))"
+        )
+        return conn
+    
+    def _load(self):
+        """Read every recorded skill into memory"""
+        try:
+            with self._connect() as conn:
+                for domain, signature, static, hits in conn.execute("SELECT * FROM skills"):
+                    self._skills[(domain, signature)] = Skill(domain, signature, bool(static), hits)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to load skill cache {self.db_path}: {e}")
+    
+    def lookup(self, url: str, task_hint: str = "") -> Optional[Skill]:
+        """Return the recorded skill for a URL, if any"""
+        with self._lock:
+            skill = self._skills.get(self.key(url, task_hint))
+            if skill is not None:
+                skill.hits += 1
+            return skill
+    
+    def record(self, url: str, static: bool, task_hint: str = ""):
+        """Remember whether a URL's page rendered without script-driven requests"""
+        domain, signature = self.key(url, task_hint)
+        with self._lock:
+            skill = self._skills.get((domain, signature))
+            if skill is not None and skill.static == static:
+                return
+            skill = self._skills[(domain, signature)] = Skill(domain, signature, static)
+        
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO skills VALUES (?, ?, ?, ?)",
+                    (domain, signature, int(static), skill.hits)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record skill for {domain}: {e}")
+    
+    def forget(self, url: str, task_hint: str = ""):
+        """Drop a skill that stopped working"""
+        domain, signature = self.key(url, task_hint)
+        with self._lock:
+            self._skills.pop((domain, signature), None)
+        
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM skills WHERE domain = ? AND signature = ?", (domain, signature))
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to forget skill for {domain}: {e}")
+
+
+# Shared keep-alive connections for static fetches; pool_block caps each
+# host at SKILL_FETCH_PER_HOST concurrent connections instead of opening more
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=int(os.getenv('SKILL_FETCH_PER_HOST', 8)),
+    pool_block=True
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+
+def fetch_static_html(url: str, timeout: float, user_agent: Optional[str] = None,
+                      cookies: Optional[Dict[str, str]] = None) -> Tuple[int, str, str]:
+    """Fetch a page over plain HTTP; returns (status, final URL, HTML with a <base> tag)"""
+    headers = {'User-Agent': user_agent or DEFAULT_USER_AGENT}
+    if cookies:
+        headers['Cookie'] = '; '.join(f"{name}={value}" for name, value in cookies.items())
+    response = _session.get(url, timeout=timeout, headers=headers)
+    html = response.text
+    base = f'<base href="{response.url}">'
+    match = _HEAD_RE.search(html)
+    if match:
+        html = html[:match.end()] + base + html[match.end():]
+    else:
+        html = base + html
+    return response.status_code, response.url, html
+
+
+_skill_cache: Optional[SkillCache] = None
+_skill_cache_lock = threading.Lock()
+
+
+def get_skill_cache() -> SkillCache:
+    """Return the process-wide skill cache, opening it on first use"""
+    global _skill_cache
+    if _skill_cache is None:
+        with _skill_cache_lock:
+            if _skill_cache is None:
+                _skill_cache = SkillCache()
+    return _skill_cache
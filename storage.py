@@ -5,12 +5,25 @@ Storage utilities for saving and exporting data in various formats
 import json
 import csv
 import os
+import atexit
+import queue
 import logging
-from typing import Dict, Any, List, Optional, Union
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Union
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, fields
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; without it stored rows are read in one go
+    ijson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +42,29 @@ class ExportConfig:
 
 
 @dataclass
+class ResultColumns:
+    """Product results stored column-wise, one list per field"""
+    title: List[str] = field(default_factory=list)
+    price: List[str] = field(default_factory=list)
+    url: List[str] = field(default_factory=list)
+    description: List[str] = field(default_factory=list)
+    rating: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.title)
+    
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Row dicts in the shape TaskResult.results and the exporters expect"""
+        names = [f.name for f in fields(self)]
+        return [dict(zip(names, values)) for values in zip(*(getattr(self, name) for name in names))]
+    
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> 'ResultColumns':
+        """Build columns from row dicts; missing fields become None"""
+        return cls(**{f.name: [row.get(f.name) for row in rows] for f in fields(cls)})
+
+
+@dataclass(init=False)
 class TaskResult:
     """Result of a task execution"""
     task_id: str
@@ -36,9 +72,34 @@ class TaskResult:
     instruction: str
     results: List[Dict[str, Any]]
     metadata: Dict[str, Any]
-    timestamp: datetime
     execution_time: float
     error_message: Optional[str] = None
+    timestamp_ns: int = 0  # wall-clock time; a datetime is only built when read
+    
+    def __init__(self, task_id: str, status: str, instruction: str, results: List[Dict[str, Any]],
+                 metadata: Dict[str, Any], timestamp: Optional[datetime] = None, execution_time: float = 0.0,
+                 error_message: Optional[str] = None, *, timestamp_ns: Optional[int] = None):
+        self.task_id = task_id
+        self.status = status
+        self.instruction = instruction
+        self.results = results
+        self.metadata = metadata
+        self.execution_time = execution_time
+        self.error_message = error_message
+        if timestamp_ns is not None:
+            self.timestamp_ns = timestamp_ns
+        elif timestamp is not None:
+            # Whole seconds plus microseconds, so the datetime round-trips exactly
+            seconds = int(timestamp.replace(microsecond=0).timestamp())
+            self.timestamp_ns = seconds * 1_000_000_000 + timestamp.microsecond * 1000
+        else:
+            self.timestamp_ns = time.time_ns()
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Local naive datetime of when the task finished"""
+        seconds, ns = divmod(self.timestamp_ns, 1_000_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -66,6 +127,78 @@ class DataStorage:
         (self.output_dir / "json").mkdir(exist_ok=True)
         (self.output_dir / "csv").mkdir(exist_ok=True)
         (self.output_dir / "screenshots").mkdir(exist_ok=True)
+        
+        # Write-behind queue, started on first use; results stay readable
+        # from _pending until their files are on disk
+        self._write_queue: Optional[queue.Queue] = None
+        self._pending: Dict[str, TaskResult] = {}
+        self._pending_lock = threading.Lock()
+    
+    def queue_task_result(self, result: TaskResult):
+        """Save task result in the background, batched with other pending writes"""
+        with self._pending_lock:
+            self._pending[result.task_id] = result
+            if self._write_queue is None:
+                self._write_queue = queue.Queue(maxsize=1024)
+                threading.Thread(target=self._write_worker, name="storage-writer", daemon=True).start()
+                atexit.register(self.flush)
+        
+        try:
+            self._write_queue.put_nowait(result)
+        except queue.Full:
+            logger.warning("Storage write queue full, saving synchronously")
+            self._write_batch([result])
+    
+    def flush(self):
+        """Block until every queued result has been written"""
+        if self._write_queue is not None:
+            self._write_queue.join()
+    
+    def _write_worker(self, max_batch: int = 64):
+        """Drain the write queue, saving up to `max_batch` results at a time"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < max_batch:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    def _write_batch(self, batch: List[TaskResult]):
+        """Save a batch and drop the saved results from the pending map"""
+        saved = self.save_task_results(batch)
+        with self._pending_lock:
+            for result, files in zip(batch, saved):
+                if files is None:
+                    logger.error(f"Task result {result.task_id} was not saved; keeping it in memory")
+                elif self._pending.get(result.task_id) is result:
+                    del self._pending[result.task_id]
+    
+    def save_task_results(self, results: List[TaskResult]) -> List[Optional[Dict[str, str]]]:
+        """Save several task results, continuing past individual failures (None)"""
+        saved = []
+        for result in results:
+            try:
+                saved.append(self.save_task_result(result))
+            except Exception:
+                saved.append(None)
+        return saved
+    
+    def get_pending(self, task_id: str) -> Optional[TaskResult]:
+        """Return a queued task result that is not on disk yet"""
+        with self._pending_lock:
+            return self._pending.get(task_id)
+    
+    def pending_ids(self) -> frozenset:
+        """IDs of queued task results that are not on disk yet"""
+        with self._pending_lock:
+            return frozenset(self._pending)
     
     def save_task_result(self, result: TaskResult) -> Dict[str, str]:
         """Save task result to storage"""
@@ -94,13 +227,21 @@ class DataStorage:
         filename = f"task_{result.task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         filepath = self.output_dir / "json" / filename
         
-        data = result.to_dict()
+        # CSV column order goes first in the file, so exports can read it
+        # without touching the rows
+        fieldnames = list(dict.fromkeys(key for row in result.results for key in row))
+        data = {'fieldnames': fieldnames, **result.to_dict()}
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            if self.config.pretty_print:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            else:
-                json.dump(data, f, ensure_ascii=False)
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if self.config.pretty_print else 0)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                if self.config.pretty_print:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(data, f, ensure_ascii=False)
         
         logger.info(f"Saved JSON: {filepath}")
         return str(filepath)
@@ -110,19 +251,23 @@ class DataStorage:
         filename = f"task_{result.task_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         filepath = self.output_dir / "csv" / filename
         
-        # Convert results to DataFrame
         if result.results:
-            df = pd.DataFrame(result.results)
+            rows = result.results
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
             
             # Add metadata columns if enabled
             if self.config.include_metadata:
-                df['task_id'] = result.task_id
-                df['status'] = result.status
-                df['instruction'] = result.instruction
-                df['timestamp'] = result.timestamp.isoformat()
-                df['execution_time'] = result.execution_time
+                metadata = {
+                    'task_id': result.task_id,
+                    'status': result.status,
+                    'instruction': result.instruction,
+                    'timestamp': result.timestamp.isoformat(),
+                    'execution_time': result.execution_time
+                }
+                rows = [{**row, **metadata} for row in rows]
+                fieldnames += [key for key in metadata if key not in fieldnames]
             
-            df.to_csv(filepath, index=False, encoding='utf-8')
+            self._write_csv_rows(filepath, rows, fieldnames)
         else:
             # Create empty CSV with headers
             with open(filepath, 'w', newline='', encoding='utf-8') as f:
@@ -139,35 +284,91 @@ class DataStorage:
         logger.info(f"Saved CSV: {filepath}")
         return str(filepath)
     
+    @staticmethod
+    def _write_csv_rows(filepath: Path, rows: List[Dict[str, Any]], fieldnames: Optional[List[str]] = None):
+        """Write dict rows as CSV; columns default to the union of keys in first-seen order"""
+        if fieldnames is None:
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    
+    def find_task_file(self, task_id: str) -> Optional[Path]:
+        """Return the stored JSON file for a task, if any"""
+        json_dir = self.output_dir / "json"
+        return next(json_dir.glob(f"task_{task_id}_*.json"), None)
+    
     def load_task_result(self, task_id: str) -> Optional[TaskResult]:
         """Load task result by ID"""
+        pending = self.get_pending(task_id)
+        if pending is not None:
+            return pending
+        
         try:
-            # Look for JSON files with this task_id
-            json_dir = self.output_dir / "json"
-            for file_path in json_dir.glob(f"task_{task_id}_*.json"):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Convert back to TaskResult
-                result = TaskResult(
-                    task_id=data['task_id'],
-                    status=data['status'],
-                    instruction=data['instruction'],
-                    results=data['results'],
-                    metadata=data['metadata'],
-                    timestamp=datetime.fromisoformat(data['timestamp']),
-                    execution_time=data['execution_time'],
-                    error_message=data.get('error_message')
-                )
-                
-                return result
+            file_path = self.find_task_file(task_id)
+            if file_path is None:
+                return None
             
-            return None
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            # Convert back to TaskResult
+            result = TaskResult(
+                task_id=data['task_id'],
+                status=data['status'],
+                instruction=data['instruction'],
+                results=data['results'],
+                metadata=data['metadata'],
+                timestamp=datetime.fromisoformat(data['timestamp']),
+                execution_time=data['execution_time'],
+                error_message=data.get('error_message')
+            )
+            
+            return result
             
         except Exception as e:
             logger.error(f"Failed to load task result {task_id}: {e}")
             return None
     
+    def iter_task_rows(self, task_id: str, file_path: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+        """Yield a task's result rows without building a TaskResult"""
+        file_path = file_path or self.find_task_file(task_id)
+        if file_path is None:
+            return
+        
+        if ijson is not None:
+            # Parse incrementally so only one row is in memory at a time
+            with open(file_path, 'rb') as f:
+                yield from ijson.items(f, 'results.item', use_float=True)
+            return
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        yield from data.get('results', [])
+    
+    def task_fieldnames(self, task_id: str, file_path: Optional[Path] = None) -> Optional[List[str]]:
+        """CSV columns for a task's results, in first-seen order; None if the task has no file"""
+        file_path = file_path or self.find_task_file(task_id)
+        if file_path is None:
+            return None
+        
+        if ijson is not None:
+            with open(file_path, 'rb') as f:
+                fieldnames = next(ijson.items(f, 'fieldnames'), None)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                fieldnames = json.load(f).get('fieldnames')
+        
+        if fieldnames is None:
+            # Saved before fieldnames were stored: take the union of every
+            # row's keys with a pass over the rows
+            fieldnames = list(dict.fromkeys(
+                key for row in self.iter_task_rows(task_id, file_path) for key in row
+            ))
+        return fieldnames
+    
     def list_task_results(self) -> List[Dict[str, Any]]:
         """List all saved task results"""
         try:
@@ -192,6 +393,22 @@ class DataStorage:
                     logger.warning(f"Failed to read {file_path}: {e}")
                     continue
             
+            # Queued results that have not reached disk yet
+            with self._pending_lock:
+                pending = list(self._pending.values())
+            saved_ids = {entry['task_id'] for entry in results}
+            for result in pending:
+                if result.task_id not in saved_ids:
+                    results.append({
+                        'task_id': result.task_id,
+                        'status': result.status,
+                        'instruction': result.instruction,
+                        'timestamp': result.timestamp.isoformat(),
+                        'execution_time': result.execution_time,
+                        'result_count': len(result.results),
+                        'file_path': None
+                    })
+            
             # Sort by timestamp (newest first)
             results.sort(key=lambda x: x['timestamp'], reverse=True)
             
@@ -212,8 +429,7 @@ class DataStorage:
                     writer = csv.writer(f)
                     writer.writerow(['No data available'])
             else:
-                df = pd.DataFrame(data)
-                df.to_csv(filepath, index=False, encoding='utf-8')
+                self._write_csv_rows(filepath, data)
             
             logger.info(f"Exported CSV: {filepath}")
             return str(filepath)
@@ -321,7 +537,6 @@ if __name__ == "__main__":
             {"title": "Laptop 2", "price": "₹42,000", "url": "https://example.com/2"}
         ],
         metadata={"browser": "chromium", "headless": True},
-        timestamp=datetime.now(),
         execution_time=15.5
     )
     
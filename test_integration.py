@@ -31,6 +31,11 @@ class TestIntegration:
         # Mock LLM manager
         self.mock_llm_manager = Mock(spec=LLMManager)
         self.mock_llm_manager.is_available.return_value = True
+        # The orchestrator parses through generate_async; route it to the
+        # generate mock each test configures
+        self.mock_llm_manager.generate_async = AsyncMock(
+            side_effect=lambda prompt, **kwargs: self.mock_llm_manager.generate(prompt, **kwargs)
+        )
         
         # Configure components
         self.browser_config = BrowserConfig(
@@ -227,6 +232,45 @@ class TestIntegration:
         assert stats['failed_tasks'] == 0
         assert stats['success_rate'] == 1.0
     
+    def test_bulk_memory_writes(self):
+        """Test that add_memories records every entry with one disk write"""
+        memory = MemoryFactory.create_memory(
+            persist_to_disk=True,
+            memory_file=os.path.join(self.temp_dir, "bulk_memory.json")
+        )
+        
+        writes = []
+        save_to_disk = memory._save_to_disk
+        
+        def counting_save():
+            if not memory._defer_depth:
+                writes.append(len(memory.memories))
+            save_to_disk()
+        
+        with patch.object(memory, '_save_to_disk', side_effect=counting_save):
+            memory_ids = memory.add_memories([
+                {"instruction": f"search item {i}", "result": {"count": i}, "task_type": "search"}
+                for i in range(3)
+            ])
+        
+        assert len(memory_ids) == 3 and all(memory_ids)
+        assert memory.get_session_stats()['total_tasks'] == 3
+        assert writes == [3]
+        
+        reloaded = MemoryFactory.create_memory(
+            persist_to_disk=True,
+            memory_file=os.path.join(self.temp_dir, "bulk_memory.json")
+        )
+        assert len(reloaded.memories) == 3
+        
+        # Editing a loaded entry leaves later loads of the same file untouched
+        reloaded.memories[0].result['count'] = -1
+        again = MemoryFactory.create_memory(
+            persist_to_disk=True,
+            memory_file=os.path.join(self.temp_dir, "bulk_memory.json")
+        )
+        assert sorted(m.result['count'] for m in again.memories) == [0, 1, 2]
+    
     def test_storage_functionality(self):
         """Test storage functionality"""
         from src.utils.storage import DataStorage, TaskResult
@@ -266,6 +310,304 @@ class TestIntegration:
         assert len(history) == 1
         assert history[0]['task_id'] == "test_001"
     
+    def test_queued_storage_writes(self):
+        """Test write-behind storage queue"""
+        from src.utils.storage import DataStorage, TaskResult
+        from datetime import datetime
+        
+        storage = DataStorage(self.storage_config)
+        
+        for i in range(3):
+            storage.queue_task_result(TaskResult(
+                task_id=f"queued_{i}",
+                status="success",
+                instruction="test instruction",
+                results=[{"title": f"Item {i}", "price": "₹1000"}],
+                metadata={},
+                timestamp=datetime.now(),
+                execution_time=1.0
+            ))
+        
+        # Queued results are readable and listed before they reach disk
+        assert storage.load_task_result("queued_0") is not None
+        assert {task['task_id'] for task in storage.list_task_results()} == {"queued_0", "queued_1", "queued_2"}
+        
+        storage.flush()
+        
+        history = storage.list_task_results()
+        assert {task['task_id'] for task in history} == {"queued_0", "queued_1", "queued_2"}
+        assert storage.find_task_file("queued_2") is not None
+    
+    def test_failed_queued_write_stays_pending(self):
+        """Test a queued result that fails to save is kept in memory"""
+        from src.utils.storage import DataStorage, TaskResult
+        
+        storage = DataStorage(self.storage_config)
+        with patch.object(storage, 'save_task_result', side_effect=OSError("disk full")):
+            storage.queue_task_result(TaskResult(
+                task_id="unsaved",
+                status="success",
+                instruction="test instruction",
+                results=[{"title": "Item", "price": "₹1000"}],
+                metadata={},
+                execution_time=1.0
+            ))
+            storage.flush()
+        
+        assert storage.get_pending("unsaved") is not None
+        assert storage.load_task_result("unsaved").results == [{"title": "Item", "price": "₹1000"}]
+        assert [task['task_id'] for task in storage.list_task_results()] == ["unsaved"]
+    
+    def test_task_fieldnames_for_legacy_files(self):
+        """Test files saved without stored fieldnames export the union of all row keys"""
+        import json
+        from src.utils.storage import DataStorage
+        
+        storage = DataStorage(self.storage_config)
+        json_dir = Path(self.storage_config.output_dir) / "json"
+        json_dir.mkdir(parents=True, exist_ok=True)
+        legacy = json_dir / "task_legacy_20250101_000000.json"
+        legacy.write_text(json.dumps({
+            "task_id": "legacy",
+            "results": [
+                {"title": "Item 1", "price": "₹1000"},
+                {"title": "Item 2", "url": "https://example.com/2"}
+            ]
+        }), encoding='utf-8')
+        
+        assert storage.task_fieldnames("legacy") == ["title", "price", "url"]
+        assert storage.task_fieldnames("missing") is None
+    
+    def test_skill_cache_keys(self):
+        """Test skill cache keys, persistence and forgetting"""
+        from src.agent.skill_cache import SkillCache
+        
+        url = "https://Example.com/item?id=1"
+        assert SkillCache.key(url) == ("example.com", "/item?id=1|")
+        assert SkillCache.key(url) != SkillCache.key("https://example.com/item?id=2")
+        
+        cache = SkillCache(os.path.join(self.temp_dir, "skills.db"))
+        cache.record(url, static=True)
+        assert cache.lookup(url).static
+        assert cache.lookup("https://example.com/item?id=2") is None
+        assert SkillCache(cache.db_path).lookup(url).static
+        
+        cache.forget(url)
+        assert cache.lookup(url) is None
+        assert SkillCache(cache.db_path).lookup(url) is None
+    
+    @pytest.mark.asyncio
+    async def test_skill_cache_fallback_to_navigation(self):
+        """Test a redirected static fetch falls back to a real navigation"""
+        from src.agent.skill_cache import SkillCache
+        from src.agent.browser_controller import BrowserController
+        
+        controller = BrowserController(BrowserConfig(use_skill_cache=False, reuse_context=False))
+        controller.skills = SkillCache(os.path.join(self.temp_dir, "skills.db"))
+        url = "https://example.com/item?id=1"
+        controller.skills.record(url, static=True)
+        
+        controller.context = AsyncMock()
+        controller.context.cookies.return_value = [{'name': 'session', 'value': 'abc'}]
+        controller.page = Mock()
+        controller.page.goto = AsyncMock(return_value=Mock(status=200))
+        
+        consent = (200, "https://consent.example.org/", "<html></html>")
+        with patch('src.agent.browser_controller.fetch_static_html', return_value=consent) as fetch:
+            result = await controller.goto(url)
+        
+        assert result.success
+        assert 'fast_path' not in result.metadata
+        assert fetch.call_args.args[3] == {'session': 'abc'}
+        controller.page.goto.assert_awaited_once_with(url, timeout=30000)
+    
+    def test_queued_memories_saved(self):
+        """Test task memories queued on the loop are saved by drain() and at loop shutdown"""
+        self.mock_llm_manager.generate.side_effect = Exception("LLM failed")
+        orchestrator = OrchestratorFactory.create_orchestrator(
+            llm_manager=self.mock_llm_manager,
+            browser_config=self.browser_config,
+            storage_config=self.storage_config,
+            memory=self.memory
+        )
+        
+        async def run_and_drain():
+            await orchestrator.execute("first instruction")
+            await orchestrator.drain()
+            return self.memory.get_session_stats()['total_tasks']
+        
+        assert asyncio.run(run_and_drain()) == 1
+        
+        # Without drain(), the loop closing saves what is still queued
+        asyncio.run(orchestrator.execute("second instruction"))
+        assert self.memory.get_session_stats()['total_tasks'] == 2
+    
+    def test_session_stats_follow_direct_memory_writes(self):
+        """Test cached session stats pick up memories added outside the orchestrator"""
+        orchestrator = OrchestratorFactory.create_orchestrator(
+            llm_manager=self.mock_llm_manager,
+            browser_config=self.browser_config,
+            storage_config=self.storage_config,
+            memory=self.memory
+        )
+        
+        before = orchestrator.get_session_stats()['total_tasks']
+        self.memory.add_memory("direct write", {"success": True}, success=True)
+        assert orchestrator.get_session_stats()['total_tasks'] == before + 1
+    
+    @pytest.mark.asyncio
+    async def test_locators_passed_to_playwright_unchanged(self, caplog):
+        """Test role=/text= locators keep Playwright's own matching and log a CSS suggestion"""
+        from src.agent.browser_controller import BrowserController, _warn_slow_locator
+        
+        _warn_slow_locator.cache_clear()
+        controller = BrowserController(BrowserConfig(use_skill_cache=False))
+        controller.page = AsyncMock()
+        
+        for selector in ('text=Login', 'role=button[name="Submit"]'):
+            result = await controller.click(selector)
+            assert result.success
+            controller.page.click.assert_awaited_with(selector, timeout=controller.config.timeout)
+            assert f"Locator {selector}" in caplog.text
+        
+        caplog.clear()
+        await controller.click('#login')
+        assert "prefer a CSS selector" not in caplog.text
+    
+    @pytest.mark.asyncio
+    async def test_cached_handle_retried_only_when_detached(self):
+        """Test a cached element is re-resolved after detaching, but other errors are not retried"""
+        from src.agent.browser_controller import BrowserController
+        
+        controller = BrowserController(BrowserConfig(use_skill_cache=False))
+        controller.page = AsyncMock()
+        fresh = AsyncMock()
+        controller.page.wait_for_selector.return_value = fresh
+        
+        stale = AsyncMock()
+        stale.click.side_effect = Exception("Element is not attached to the DOM")
+        controller._element_cache['#buy'] = stale
+        assert (await controller.click('#buy')).success
+        fresh.click.assert_awaited_once()
+        
+        timed_out = AsyncMock()
+        timed_out.click.side_effect = Exception("Timeout 30000ms exceeded")
+        controller._element_cache['#buy'] = timed_out
+        assert not (await controller.click('#buy')).success
+        timed_out.click.assert_awaited_once()
+        fresh.click.assert_awaited_once()
+    
+    def test_process_results(self):
+        """Test results are deduplicated, filtered by price, sorted and limited"""
+        from src.agent.parser import ParsedInstruction
+        
+        orchestrator = OrchestratorFactory.create_orchestrator(
+            llm_manager=self.mock_llm_manager,
+            browser_config=self.browser_config,
+            storage_config=self.storage_config,
+            memory=self.memory
+        )
+        results = [
+            {"title": "Laptop A", "url": "https://example.com/a", "price": "₹45,000", "rating": "4.2"},
+            {"title": "laptop a ", "url": "HTTPS://EXAMPLE.COM/A", "price": "₹25,000", "rating": "5.0"},
+            {"title": "Laptop B", "url": "https://example.com/b", "price": "₹60,000", "rating": "4.9"},
+            {"title": "Laptop C", "url": "https://example.com/c", "price": "₹30,000", "rating": "4.5"},
+            {"title": "Laptop D", "url": "https://example.com/d", "rating": "4.7"},
+            {"title": "Laptop E", "url": "https://example.com/e", "price": "₹20,000", "rating": "3.9"},
+            {"title": "Laptop F", "url": "https://example.com/f", "price": "₹10,000", "rating": "4.8"}
+        ]
+        
+        def process(sort, count):
+            parsed = ParsedInstruction(
+                task="search", query="laptops",
+                filters={"price_max": 50000, "price_min": 15000, "sort": sort},
+                count=count, fields=[], target_url=None, selectors={}, actions=[],
+                raw_instruction="search laptops"
+            )
+            return [row["title"] for row in orchestrator._process_results(results, parsed)]
+        
+        assert process("price", 2) == ["Laptop E", "Laptop C"]
+        assert process("rating", 5) == ["Laptop C", "Laptop A", "Laptop E"]
+        assert process(None, 5) == ["Laptop A", "Laptop C", "Laptop E"]
+    
+    def test_extractor_prices_and_ratings(self):
+        """Test the leftmost price wins and the shared scan matches separate extraction"""
+        import random
+        from src.agent.extractor import ExtractorFactory
+        
+        extractor = ExtractorFactory.create_extractor()
+        assert extractor._extract_price("Rs. 1,299 was ₹2,000") == "₹1,299"
+        assert extractor._extract_rating("rated 4.5 out of 5, 3 stars last year") == "4.5"
+        
+        tokens = [
+            "₹1,299", "Rs. 450", "INR 2,000.50", "300 rupees", "75 ₹", "4.5 out of 5",
+            "3/5", "4 stars", "rating: 3.8", "Laptop", "was", "5", "deal", "₹", "Rs", "/", "out of"
+        ]
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = " ".join(rng.choices(tokens, k=rng.randint(0, 8)))
+            assert extractor._extract_price_and_rating(text) == (
+                extractor._extract_price(text), extractor._extract_rating(text)
+            )
+    
+    def test_extractor_clean_text_ascii_table(self):
+        """Test the ASCII translate path strips the same characters as the regex"""
+        import random
+        import string
+        from src.agent import extractor as extractor_module
+        
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = "".join(rng.choices(string.printable, k=rng.randint(0, 40)))
+            expected = extractor_module._SPECIAL_CHARS_RE.sub('', extractor_module._WHITESPACE_RE.sub(' ', text)).strip()
+            assert extractor_module._clean_text(text) == expected
+    
+    def test_extractor_deduplicate_casefold(self):
+        """Test dedup keys ignore Unicode case and whitespace, keeping the first item"""
+        from src.agent.extractor import ExtractorFactory, ExtractedData
+        
+        items = [
+            ExtractedData(title="Straße Bike", url="https://example.com/1", price="₹100"),
+            ExtractedData(title=" STRASSE BIKE", url="https://example.com/1", price="₹200"),
+            ExtractedData(title="Straße Bike", url="https://example.com/2")
+        ]
+        unique = ExtractorFactory.create_extractor().deduplicate(items)
+        assert [(item.url, item.price) for item in unique] == [
+            ("https://example.com/1", "₹100"), ("https://example.com/2", None)
+        ]
+    
+    def test_extractor_vectorized_matches_python(self):
+        """Test the NumPy filter/sort path for large batches matches the plain Python path"""
+        import random
+        pytest.importorskip("numpy")
+        from src.agent import extractor as extractor_module
+        
+        extractor = extractor_module.ExtractorFactory.create_extractor()
+        rng = random.Random(0)
+        data = [
+            extractor_module.ExtractedData(
+                title=f"Item {i}",
+                price=rng.choice([None, "", "call for price", f"₹{rng.randint(1, 99)},{rng.randint(0, 999):03d}"]),
+                rating=rng.choice([None, "", "n/a", str(rng.randint(0, 50) / 10)])
+            )
+            for i in range(2 * extractor_module.VECTORIZE_MIN_ITEMS)
+        ]
+        
+        def run():
+            return (
+                extractor.filter_by_price(data, max_price=50000, min_price=10000),
+                extractor.filter_by_price(data, max_price=50000),
+                extractor.sort_by_price(data),
+                extractor.sort_by_price(data, reverse=True),
+                extractor.sort_by_rating(data),
+                extractor.sort_by_rating(data, reverse=False)
+            )
+        
+        vectorized = run()
+        with patch.object(extractor_module, 'VECTORIZE_MIN_ITEMS', len(data) + 1):
+            plain = run()
+        assert vectorized == plain
+    
     def test_error_handling(self):
         """Test error handling in orchestrator"""
         # Mock LLM to raise exception
@@ -91,6 +91,25 @@ class TestInstructionParser:
         assert result.query == "search for laptops"
         assert result.raw_instruction == "search for laptops"
     
+    def test_parse_cache_skips_llm_for_repeated_instruction(self):
+        """Test that a repeated instruction is answered from the parse cache"""
+        mock_response = LLMResponse(
+            content='{"task": "search", "query": "laptops", "actions": []}',
+            model="test-model"
+        )
+        self.mock_llm_manager.generate.return_value = mock_response
+        
+        first = self.parser.parse("search laptops")
+        second = self.parser.parse("  Search   laptops ")
+        
+        assert self.mock_llm_manager.generate.call_count == 1
+        assert second.task == first.task == "search"
+        assert second.raw_instruction == "  Search   laptops "
+        
+        # Cached plans are copies; mutating one doesn't leak into the next
+        second.filters["price_max"] = 1
+        assert "price_max" not in self.parser.parse("search laptops").filters
+    
     def test_extract_json_from_response(self):
         """Test JSON extraction from LLM response"""
         # Test with valid JSON
@@ -0,0 +1,268 @@
+"""
+Request-handling infrastructure shared by the Flask apps (app.py, app_fixed.py)
+"""
+
+import os
+import io
+import itertools
+import csv
+import hashlib
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from operator import attrgetter
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+import orjson
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster (de)serialization"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Largest accepted request body (bytes)
+MAX_REQUEST_SIZE = int(os.getenv('MAX_REQUEST_SIZE', 1024 * 1024))
+
+# CORS headers are identical for every response, so set them once here
+# instead of through per-request middleware
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type'
+}
+
+
+def add_cors_headers(response):
+    """Attach the fixed CORS headers (including to automatic OPTIONS replies)"""
+    response.headers.update(_CORS_HEADERS)
+    return response
+
+
+def configure_app(app):
+    """Install the orjson provider, request size limit and CORS headers on an app"""
+    app.json = OrjsonProvider(app)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_SIZE
+    app.after_request(add_cors_headers)
+
+
+# ExecutionResult fields returned by /run, in response order
+_RESULT_FIELDS = (
+    'task_id', 'status', 'instruction', 'results',
+    'execution_time', 'error_message', 'logs', 'metadata'
+)
+_get_result_fields = attrgetter(*_RESULT_FIELDS)
+
+
+def result_response(result) -> Response:
+    """Serialize an ExecutionResult for /run straight to bytes"""
+    return Response(
+        orjson.dumps(
+            dict(zip(_RESULT_FIELDS, _get_result_fields(result))),
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS
+        ),
+        mimetype="application/json"
+    )
+
+
+def stream_csv(rows, fieldnames=None, batch: int = 1000):
+    """Yield CSV text for result dicts, flushing every `batch` rows"""
+    # Rows are consumed lazily; without `fieldnames` the header is the first
+    # row's keys, and keys that only appear in later rows are left out
+    rows = iter(rows)
+    first = next(rows, None)
+    
+    buf = io.StringIO()
+    if first is None:
+        csv.writer(buf).writerow(['No data available'])
+        yield buf.getvalue()
+        return
+    
+    writer = csv.DictWriter(buf, fieldnames=fieldnames or list(first), extrasaction='ignore')
+    writer.writeheader()
+    
+    for i, row in enumerate(itertools.chain([first], rows), 1):
+        writer.writerow(row)
+        if i % batch == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+    
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def stream_json(rows, batch: int = 1000):
+    """Yield a JSON array of result dicts in chunks of `batch` rows"""
+    parts = []
+    sep = b'['
+    for row in rows:
+        parts.append(sep)
+        parts.append(orjson.dumps(row, default=str))
+        sep = b','
+        if len(parts) >= 2 * batch:
+            yield b''.join(parts)
+            parts.clear()
+    
+    if sep == b'[':
+        parts.append(sep)
+    parts.append(b']')
+    yield b''.join(parts)
+
+
+def attachment(body, filename: str, mimetype: str) -> Response:
+    """Wrap a body or generator as a file download"""
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+def conditional_export(response: Response, task_id: str, file_path) -> Response:
+    """Tag an export with ETag/Last-Modified so repeat downloads get a 304"""
+    mtime = os.stat(file_path).st_mtime
+    etag = hashlib.blake2b(f"{task_id}-{mtime}".encode(), digest_size=8).hexdigest()
+    response.set_etag(etag)
+    response.last_modified = mtime
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+
+# (epoch second, isoformat, filename stamp) for the current second
+_ts_cache = (0, '', '')
+
+
+def now_strs():
+    """Return (isoformat, '%Y%m%d_%H%M%S') for now, formatted once per second"""
+    global _ts_cache
+    second = int(time.time())
+    cached = _ts_cache
+    if second != cached[0]:
+        dt = datetime.fromtimestamp(second)
+        cached = _ts_cache = (second, dt.isoformat(), dt.strftime('%Y%m%d_%H%M%S'))
+    return cached[1], cached[2]
+
+
+# Background event loop shared by all requests so the orchestrator's
+# async resources survive between calls
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="orchestrator-loop", daemon=True).start()
+
+# Upper bound on how long a request waits for a task (seconds)
+TASK_TIMEOUT = float(os.getenv('TASK_TIMEOUT', 120))
+
+
+def run_async(coro, timeout: float = TASK_TIMEOUT):
+    """Run a coroutine on the background loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, _loop)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+# Bounded cache of loaded task results; history and stats are memoized
+# by the orchestrator itself
+_results_cache = TTLCache(maxsize=512, ttl=60)
+_cache_lock = threading.Lock()
+
+
+def invalidate_caches(task_id: str):
+    """Drop the cached result of a task that was just written"""
+    with _cache_lock:
+        _results_cache.pop(task_id, None)
+
+
+def cached_task_result(task_id: str):
+    """Return a task result already in the cache, without touching disk"""
+    with _cache_lock:
+        return _results_cache.get(task_id)
+
+# Loads currently reading a task from disk, shared by concurrent requests
+_inflight_loads = {}
+
+
+def load_task_result(storage, task_id: str):
+    """Load a task result through the cache, coalescing concurrent disk reads"""
+    with _cache_lock:
+        cached = _results_cache.get(task_id)
+        if cached is not None:
+            return cached
+        future = _inflight_loads.get(task_id)
+        owner = future is None
+        if owner:
+            future = _inflight_loads[task_id] = Future()
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        task_result = storage.load_task_result(task_id)
+        with _cache_lock:
+            if task_result is not None:
+                _results_cache[task_id] = task_result
+            _inflight_loads.pop(task_id, None)
+        future.set_result(task_result)
+        return task_result
+    except BaseException as e:
+        with _cache_lock:
+            _inflight_loads.pop(task_id, None)
+        future.set_exception(e)
+        raise
+
+
+# Build the orchestrator in the background at startup
+ORCHESTRATOR_WARMUP = os.getenv('ORCHESTRATOR_WARMUP', 'true').lower() == 'true'
+
+
+class SharedOrchestrator:
+    """The orchestrator shared by every request, built once on first use"""
+    
+    def __init__(self, build):
+        self._build = build
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    def get(self):
+        """Get the shared orchestrator, building it once under a lock"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._build()
+        return self._instance
+    
+    def drain(self):
+        """Save memory records still queued on the background loop before exit"""
+        if self._instance is None or not _loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._instance.drain(), _loop).result(timeout=TASK_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Failed to save queued memories on shutdown: {e}")
+    
+    def warm(self):
+        """Build the orchestrator ahead of the first request"""
+        try:
+            self.get()
+        except Exception as e:
+            logger.error(f"Orchestrator warm-up failed: {e}")
+    
+    def start(self):
+        """Drain at exit and, unless disabled, build the orchestrator in the background"""
+        atexit.register(self.drain)
+        if ORCHESTRATOR_WARMUP:
+            threading.Thread(target=self.warm, name="orchestrator-warmup", daemon=True).start()
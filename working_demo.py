@@ -6,7 +6,6 @@ import os
 import sys
 import asyncio
 import json
-from datetime import datetime
 
 # Set environment variables
 os.environ['LLM_TYPE'] = 'ollama'
@@ -127,7 +126,6 @@ async def working_demo():
                 {"title": "Demo Item 2", "price": "₹2000", "url": "https://example.com/2"}
             ],
             metadata={"demo": True},
-            timestamp=datetime.now(),
             execution_time=1.5
         )
         